@@ -55,6 +55,12 @@ from youtube_uploader import upload_video_with_metadata
 from thumbnail_ab_testing import ThumbnailVariationGenerator
 from audio_quality_validator import AudioQualityValidator
 
+# Optional binary copy of timing/manifest next to the JSON (MANIFEST_FORMAT=both)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 BADGE_LABELS = {
     "economics": "経済",
     "technology": "テック",
@@ -83,6 +89,45 @@ from podcast_api import (
 BASE = Path(__file__).parent
 OUT = BASE / "outputs"
 
+# Number of Podcast API episodes rendered at the same time (1 = sequential).
+# Higher values overlap VOICEVOX/network waits but multiply peak memory.
+PODCAST_API_CONCURRENCY = max(1, int(os.getenv("PODCAST_API_CONCURRENCY", "1")))
+
+
+def _save_json(path: Path, data) -> None:
+    """
+    Write JSON atomically: dump to a sibling temp file, then rename over the target.
+
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# json (default) | both. JSON is always written for debugging; "both" adds a .msgpack copy.
+MANIFEST_FORMAT = os.getenv("MANIFEST_FORMAT", "json").lower()
+if MANIFEST_FORMAT not in ("json", "both"):
+    print(f"⚠️  Unknown MANIFEST_FORMAT={MANIFEST_FORMAT!r} (expected json or both), writing JSON only")
+    MANIFEST_FORMAT = "json"
+elif MANIFEST_FORMAT == "both" and msgpack is None:
+    print("⚠️  MANIFEST_FORMAT=both needs `pip install msgpack`, writing JSON only")
+
+
+def _save_structured(json_path: Path, data) -> None:
+    """
+    Save timing/manifest data as JSON, plus MessagePack when MANIFEST_FORMAT=both.
+
+    The .msgpack file sits next to the JSON one (timing.json -> timing.msgpack).
+    """
+    _save_json(json_path, data)
+    if MANIFEST_FORMAT == "both" and msgpack is not None:
+        msgpack_path = json_path.with_suffix(".msgpack")
+        tmp_path = msgpack_path.with_name(msgpack_path.name + ".tmp")
+        tmp_path.write_bytes(msgpack.packb(data, use_bin_type=True))
+        os.replace(tmp_path, msgpack_path)
+
 
 def generate_single_video(
     video_number: int = 1,
@@ -150,12 +195,10 @@ def generate_single_video(
             }
 
             # Save topic analysis
-            json.dump(topic_analysis, open(outdir / "topic.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "topic.json", topic_analysis)
 
             # Save script
-            json.dump(script, open(outdir / "script.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "script.json", script)
 
             # Notify start
             notify_video_start(video_number, topic_title, duration_minutes)
@@ -182,12 +225,10 @@ def generate_single_video(
             }
 
             # Save topic analysis
-            json.dump(topic_analysis, open(outdir / "topic.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "topic.json", topic_analysis)
 
             # Save script
-            json.dump(script, open(outdir / "script.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "script.json", script)
 
             # Notify start
             notify_video_start(video_number, topic_title, duration_minutes)
@@ -233,8 +274,7 @@ def generate_single_video(
             print(f"  Selected: {topic_title}")
 
             # Save topic analysis
-            json.dump(topic_analysis, open(outdir / "topic.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "topic.json", topic_analysis)
 
             # Notify start
             notify_video_start(video_number, topic_title, duration_minutes)
@@ -246,8 +286,7 @@ def generate_single_video(
             print(f"  Dialogues: {len(script['dialogues'])} exchanges")
 
             # Save script
-            json.dump(script, open(outdir / "script.json", "w", encoding="utf-8"),
-                      ensure_ascii=False, indent=2)
+            _save_json(outdir / "script.json", script)
 
         # Step 3: Use fixed background image (AI generation no longer needed)
         print("\n[3/10] 🖼️  Using fixed background image...")
@@ -380,8 +419,7 @@ def generate_single_video(
                     bg["start"] = timing_data[sections[sect_idx].get("start_dialogue_index", 0)]["start"]
 
         # Save timing data
-        json.dump(timing_data, open(outdir / "timing.json", "w", encoding="utf-8"),
-                  ensure_ascii=False, indent=2)
+        _save_structured(outdir / "timing.json", timing_data)
 
         print(f"  ⚡ Parallel processing complete!")
 
@@ -417,8 +455,7 @@ def generate_single_video(
             "audio": audio_report,
             "sync": sync_report
         }
-        json.dump(quality_report, open(outdir / "quality_report.json", "w", encoding="utf-8"),
-                  ensure_ascii=False, indent=2)
+        _save_json(outdir / "quality_report.json", quality_report)
 
         # Step 5: Create video with subtitles
         print("\n[5/10] 🎬 Creating video with subtitles (FFmpeg)...")
@@ -455,8 +492,7 @@ def generate_single_video(
         print(f"  Timestamps: {len(metadata.get('timestamps', []))}")
 
         # Save metadata
-        json.dump(metadata, open(outdir / "metadata.json", "w", encoding="utf-8"),
-                  ensure_ascii=False, indent=2)
+        _save_json(outdir / "metadata.json", metadata)
 
         # Step 7: Generate engagement comments with templates
         print("\n[7/10] 💬 Generating engagement comments...")
@@ -469,8 +505,7 @@ def generate_single_video(
 
         # Combine both types
         comments = llm_comments + template_comments
-        json.dump({"comments": comments}, open(outdir / "comments.json", "w", encoding="utf-8"),
-                  ensure_ascii=False, indent=2)
+        _save_json(outdir / "comments.json", {"comments": comments})
         print(f"  Generated {len(comments)} comments (Gemini: {len(llm_comments)}, Template: {len(template_comments)})")
 
         # Step 8: Generate thumbnail with background + PIL text overlay
@@ -528,12 +563,7 @@ def generate_single_video(
                 print(f"  Generated {len(variants)} variations in: {variants_dir}")
 
                 # Save variant metadata
-                json.dump(
-                    {"variants": variants},
-                    open(outdir / "thumbnail_variants.json", "w", encoding="utf-8"),
-                    ensure_ascii=False,
-                    indent=2
-                )
+                _save_json(outdir / "thumbnail_variants.json", {"variants": variants})
             except Exception as e:
                 print(f"  ⚠️  Failed to generate thumbnail variants: {e}")
 
@@ -639,8 +669,7 @@ def generate_single_video(
             "youtube_upload": youtube_result,
             "created_at": datetime.datetime.now().isoformat()
         }
-        json.dump(manifest, open(outdir / "manifest.json", "w", encoding="utf-8"),
-                  ensure_ascii=False, indent=2)
+        _save_structured(outdir / "manifest.json", manifest)
 
         # Notify completion
         notify_video_complete(video_number, topic_title, str(video_path), video_duration, metadata)
@@ -883,7 +912,8 @@ def generate_videos_from_sheets(
 
 def generate_videos_from_podcast_api(
     topic_category: str = "ai_news",
-    duration_minutes: int = 10
+    duration_minutes: int = 10,
+    concurrency: int = PODCAST_API_CONCURRENCY
 ) -> list:
     """
     Generate videos from Podcast API data
@@ -894,6 +924,7 @@ def generate_videos_from_podcast_api(
     Args:
         topic_category: Category for topic (used for metadata)
         duration_minutes: Target duration per video
+        concurrency: Number of podcasts rendered in parallel (1 = sequential)
 
     Returns:
         List of video manifests
@@ -915,13 +946,8 @@ def generate_videos_from_podcast_api(
 
     print(f"Found {len(pending_podcasts)} pending podcast(s)")
 
-    results = []
-    successful = 0
-    failed = 0
-    total_duration = 0
-    topics = []
-
-    for idx, podcast_data in enumerate(pending_podcasts, start=1):
+    def process_podcast(idx: int, podcast_data: dict):
+        """Render one podcast. Returns (result, succeeded)."""
         try:
             print(f"\n--- Processing podcast id={podcast_data['id']} ({idx}/{len(pending_podcasts)}) ---")
 
@@ -932,27 +958,54 @@ def generate_videos_from_podcast_api(
                 use_web_search=False,
                 podcast_api_data=podcast_data
             )
-            results.append(manifest)
-            successful += 1
-            total_duration += manifest.get("duration_seconds", 0)
-            topics.append(manifest.get("script", {}).get("title", "Unknown"))
-
-            # Wait between videos to avoid rate limits
-            if idx < len(pending_podcasts):
-                print(f"\n⏳ Waiting 10 seconds before next video...\n")
-                import time
-                time.sleep(10)
+            return manifest, True
 
         except Exception as e:
             print(f"Failed to generate video from podcast id={podcast_data['id']}: {e}")
-            failed += 1
-            results.append({"error": str(e), "podcast_id": podcast_data['id']})
 
             # Mark as error in API
             try:
                 update_podcast_status(podcast_data['id'], "error")
             except:
                 pass
+            return {"error": str(e), "podcast_id": podcast_data['id']}, False
+
+    outcomes = []
+    if concurrency > 1 and len(pending_podcasts) > 1:
+        workers = min(concurrency, len(pending_podcasts))
+        print(f"Rendering up to {workers} podcasts in parallel")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(process_podcast, idx, podcast_data)
+                for idx, podcast_data in enumerate(pending_podcasts, start=1)
+            ]
+            # Keep API order in the results regardless of completion order
+            outcomes = [future.result() for future in futures]
+    else:
+        for idx, podcast_data in enumerate(pending_podcasts, start=1):
+            outcome = process_podcast(idx, podcast_data)
+            outcomes.append(outcome)
+
+            # Wait between videos to avoid rate limits
+            if outcome[1] and idx < len(pending_podcasts):
+                print(f"\n⏳ Waiting 10 seconds before next video...\n")
+                import time
+                time.sleep(10)
+
+    results = []
+    successful = 0
+    failed = 0
+    total_duration = 0
+    topics = []
+
+    for result, succeeded in outcomes:
+        results.append(result)
+        if succeeded:
+            successful += 1
+            total_duration += result.get("duration_seconds", 0)
+            topics.append(result.get("script", {}).get("title", "Unknown"))
+        else:
+            failed += 1
 
     # Send daily summary
     notify_daily_summary(
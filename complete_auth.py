@@ -1,5 +1,4 @@
 from google_auth_oauthlib.flow import InstalledAppFlow
-import pickle
 
 SCOPES = [
     'https://www.googleapis.com/auth/youtube.upload',
@@ -12,9 +11,9 @@ flow = InstalledAppFlow.from_client_secrets_file('youtube_credentials.json', SCO
 code = "4/0ASc3gC0kqxpnRZdAsybZPY8CzV7wKcOWxL5NSSV1mafORGEoZSneMHuoudOl5LZfePlEog"
 flow.fetch_token(code=code)
 
-# トークンを保存
-with open('youtube_auth.pickle', 'wb') as f:
-    pickle.dump(flow.credentials, f)
+# トークンを保存（JSON形式、youtube_uploader.TOKEN_FILE と同じファイル）
+with open('youtube_auth.json', 'w', encoding='utf-8') as f:
+    f.write(flow.credentials.to_json())
 
 print("✅ 認証が完了しました！")
-print(f"トークンを保存: youtube_auth.pickle")
+print(f"トークンを保存: youtube_auth.json")
@@ -3,6 +3,7 @@ English to Katakana Converter for IT/Tech News TTS
 Comprehensive dictionary for AI, programming, cloud, and tech company terms
 """
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 
 # =============================================================================
@@ -814,6 +815,28 @@ PHONETIC_MAP = {
 }
 
 
+# English words (sequences of letters, at least 1 char)
+_ENGLISH_WORD_RE = re.compile(r'[a-zA-Z]+')
+
+
+@lru_cache(maxsize=4096)
+def _convert_word(word: str) -> str:
+    """Convert a single English word; memoized since scripts repeat the same terms."""
+    lower_word = word.lower()
+
+    # Check dictionary first
+    if lower_word in COMMON_WORDS:
+        return COMMON_WORDS[lower_word]
+
+    # For all-uppercase acronyms (like AI, GPU, FP64)
+    if word.isupper() and len(word) <= 6:
+        # Already handled by dictionary, skip
+        return word
+
+    # Fallback: keep as-is (VOICEVOX will handle it, or add to dictionary later)
+    return word
+
+
 def convert_english_to_katakana(text: str) -> str:
     """
     Convert English words in text to katakana for TTS pronunciation.
@@ -827,35 +850,8 @@ def convert_english_to_katakana(text: str) -> str:
     Returns:
         Text with English words converted to katakana
     """
-    # Pattern to match English words (sequences of letters, at least 1 char)
     # Single letters are now handled (a, the, etc. in dictionary)
-    pattern = r'[a-zA-Z]+'
-
-    def replace_word(match):
-        word = match.group(0)
-        lower_word = word.lower()
-
-        # Check dictionary first
-        if lower_word in COMMON_WORDS:
-            return COMMON_WORDS[lower_word]
-
-        # For all-uppercase acronyms (like AI, GPU, FP64)
-        if word.isupper() and len(word) <= 6:
-            # Already handled by dictionary, skip
-            return word
-
-        # For capitalized words, try lowercase version
-        if word[0].isupper() and len(word) <= 10:
-            if lower_word in COMMON_WORDS:
-                return COMMON_WORDS[lower_word]
-
-        # Fallback: keep as-is (VOICEVOX will handle it, or add to dictionary later)
-        return word
-
-    # Replace English words with katakana equivalents
-    result = re.sub(pattern, replace_word, text)
-
-    return result
+    return _ENGLISH_WORD_RE.sub(lambda m: _convert_word(m.group(0)), text)
 
 
 def preprocess_text_for_tts(text: str) -> str:
@@ -9,6 +9,12 @@ import re
 from typing import Dict, Any, List
 from pathlib import Path
 
+# Optional faster JSON decoding for past-video metadata (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Ollama integration
 try:
     from ollama_client import call_ollama, check_ollama_health
@@ -44,29 +50,37 @@ A: [話者Aのセリフ]
 **出力:**
 """
 
+def _load_json(path: Path) -> Any:
+    """Load a JSON file, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 def get_past_topics(max_count: int = 20) -> List[str]:
     """Get past video topics to avoid duplicates."""
     past_topics = []
     outputs_dir = Path(__file__).parent / "outputs"
     if not outputs_dir.exists():
         return past_topics
-    for date_dir in sorted(outputs_dir.iterdir(), reverse=True):
-        if not date_dir.is_dir(): continue
-        for video_dir in date_dir.iterdir():
-            if not video_dir.is_dir(): continue
+    # scandir's DirEntry.is_dir() reuses the directory listing instead of a stat per entry
+    with os.scandir(outputs_dir) as it:
+        date_dirs = sorted((e.path for e in it if e.is_dir()), reverse=True)
+    for date_dir in date_dirs:
+        with os.scandir(date_dir) as it:
+            video_dirs = [Path(e.path) for e in it if e.is_dir()]
+        for video_dir in video_dirs:
             metadata_file = video_dir / "metadata.json"
             script_file = video_dir / "script.json"
             try:
                 if metadata_file.exists():
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                        title = metadata.get("youtube_title", "") or metadata.get("title", "")
-                        if title: past_topics.append(title)
+                    metadata = _load_json(metadata_file)
+                    title = metadata.get("youtube_title", "") or metadata.get("title", "")
+                    if title: past_topics.append(title)
                 elif script_file.exists():
-                    with open(script_file, 'r', encoding='utf-8') as f:
-                        script = json.load(f)
-                        title = script.get("title", "")
-                        if title: past_topics.append(title)
+                    script = _load_json(script_file)
+                    title = script.get("title", "")
+                    if title: past_topics.append(title)
             except: continue
             if len(past_topics) >= max_count: return past_topics
     return past_topics
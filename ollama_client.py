@@ -5,6 +5,7 @@ Replaces Gemini API calls with local inference
 
 import os
 import json
+import time
 import requests
 from typing import Optional
 
@@ -12,6 +13,16 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q4_K_M")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "300"))  # 5分
 
+# Health-check result cache: healthy results are trusted longer than failures
+OLLAMA_HEALTH_TTL_OK = float(os.getenv("OLLAMA_HEALTH_TTL_OK", "60"))
+OLLAMA_HEALTH_TTL_FAIL = float(os.getenv("OLLAMA_HEALTH_TTL_FAIL", "10"))
+_health_cache = {"ok": None, "checked_at": 0.0}
+
+
+def _mark_unhealthy() -> None:
+    """Record a failed request so callers skip Ollama until the failure TTL expires."""
+    _health_cache.update(ok=False, checked_at=time.monotonic())
+
 
 def call_ollama(
     prompt: str,
@@ -55,13 +66,33 @@ def call_ollama(
         data = response.json()
         return data.get("response", "")
     except requests.exceptions.Timeout:
+        _mark_unhealthy()
         raise RuntimeError(f"Ollama request timed out after {OLLAMA_TIMEOUT}s")
     except requests.exceptions.RequestException as e:
+        _mark_unhealthy()
         raise RuntimeError(f"Ollama API error: {e}")
 
 
-def check_ollama_health() -> bool:
-    """Check if Ollama server is running and model is available"""
+def check_ollama_health(use_cache: bool = True) -> bool:
+    """
+    Check if Ollama server is running and model is available.
+
+    The result is cached (OLLAMA_HEALTH_TTL_OK / OLLAMA_HEALTH_TTL_FAIL seconds)
+    so repeated LLM calls do not each probe /api/tags.
+    """
+    now = time.monotonic()
+    if use_cache and _health_cache["ok"] is not None:
+        ttl = OLLAMA_HEALTH_TTL_OK if _health_cache["ok"] else OLLAMA_HEALTH_TTL_FAIL
+        if now - _health_cache["checked_at"] < ttl:
+            return _health_cache["ok"]
+
+    ok = _probe_ollama()
+    _health_cache.update(ok=ok, checked_at=now)
+    return ok
+
+
+def _probe_ollama() -> bool:
+    """Query /api/tags for the configured model"""
     try:
         response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
         if response.status_code != 200:
@@ -80,7 +111,7 @@ if __name__ == "__main__":
     print(f"Testing Ollama client with model: {OLLAMA_MODEL}")
     print(f"Ollama URL: {OLLAMA_BASE_URL}")
 
-    if check_ollama_health():
+    if check_ollama_health(use_cache=False):
         print("✅ Ollama is healthy and model is available")
 
         # Test Japanese response
@@ -1,6 +1,10 @@
 import os
 import feedparser
-from typing import List, Dict, Any
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
@@ -35,6 +39,30 @@ RSS_FEEDS = {
     ]
 }
 
+RSS_TIMEOUT = int(os.getenv("RSS_TIMEOUT", "15"))
+
+# Shared keep-alive session for feed downloads (feeds from the same host reuse connections)
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = feedparser.USER_AGENT
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504)),
+))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+
+def _fetch_feed(feed_url: str) -> Optional[feedparser.FeedParserDict]:
+    """Download one feed through the shared session and parse it (None on failure)."""
+    try:
+        response = _SESSION.get(feed_url, timeout=RSS_TIMEOUT)
+        response.raise_for_status()
+        return feedparser.parse(response.content, response_headers=dict(response.headers))
+    except Exception as e:
+        print(f"[RSS] Failed to fetch {feed_url}: {e}")
+        return None
+
+
 def fetch_rss_news(category: str = "technology", max_results: int = 15) -> List[Dict[str, Any]]:
     """
     Fetch news from RSS feeds for a specific category.
@@ -56,10 +84,14 @@ def fetch_rss_news(category: str = "technology", max_results: int = 15) -> List[
 
     print(f"[RSS] Fetching {category} news from {len(feeds)} feeds...")
 
-    for feed_url in feeds:
+    # Feeds are independent network reads: download them concurrently, then parse in order
+    with ThreadPoolExecutor(max_workers=min(8, len(feeds))) as executor:
+        fetched = list(executor.map(_fetch_feed, feeds))
+
+    for feed_url, feed in zip(feeds, fetched):
+        if feed is None:
+            continue
         try:
-            feed = feedparser.parse(feed_url)
-            
             # Identify source name
             source_title = feed.feed.get('title', 'Unknown Source')
             
@@ -0,0 +1,115 @@
+"""
+Unit tests for ollama_client health-check caching.
+
+Tests cover:
+- A healthy result is reused within OLLAMA_HEALTH_TTL_OK
+- A failed result is re-probed after OLLAMA_HEALTH_TTL_FAIL
+- _mark_unhealthy (and a failed request) forces a re-probe once it expires
+- use_cache=False always probes
+"""
+import pytest
+import requests
+
+import ollama_client
+
+
+class FakeClock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def health(monkeypatch):
+    """Fresh health cache, patched clock and a scripted _probe_ollama."""
+    clock = FakeClock()
+    probes = []
+    results = {"ok": True}
+
+    def fake_probe():
+        probes.append(clock.now)
+        return results["ok"]
+
+    monkeypatch.setattr(ollama_client, "time", clock)
+    monkeypatch.setattr(ollama_client, "_probe_ollama", fake_probe)
+    monkeypatch.setattr(ollama_client, "OLLAMA_HEALTH_TTL_OK", 60.0)
+    monkeypatch.setattr(ollama_client, "OLLAMA_HEALTH_TTL_FAIL", 10.0)
+    monkeypatch.setattr(ollama_client, "_health_cache", {"ok": None, "checked_at": 0.0})
+    return clock, probes, results
+
+
+def test_healthy_result_reused_within_ttl(health):
+    """A cached OK is trusted for 60s, then probed again."""
+    clock, probes, results = health
+
+    assert ollama_client.check_ollama_health()
+    clock.now += 59
+    assert ollama_client.check_ollama_health()
+    assert len(probes) == 1
+
+    clock.now += 1
+    assert ollama_client.check_ollama_health()
+    assert len(probes) == 2
+
+
+def test_failure_reprobed_after_fail_ttl(health):
+    """A failed probe is cached for 10s only, so a recovered server is picked up quickly."""
+    clock, probes, results = health
+    results["ok"] = False
+
+    assert not ollama_client.check_ollama_health()
+    clock.now += 9
+    assert not ollama_client.check_ollama_health()
+    assert len(probes) == 1
+
+    results["ok"] = True
+    clock.now += 1
+    assert ollama_client.check_ollama_health()
+    assert len(probes) == 2
+
+
+def test_mark_unhealthy_forces_reprobe(health):
+    """A cached OK is replaced by the failure, and re-probed once the failure TTL passes."""
+    clock, probes, results = health
+    assert ollama_client.check_ollama_health()
+
+    ollama_client._mark_unhealthy()
+
+    assert not ollama_client.check_ollama_health()
+    assert len(probes) == 1
+    clock.now += 10
+    assert ollama_client.check_ollama_health()
+    assert len(probes) == 2
+
+
+def test_failed_request_marks_unhealthy(health, monkeypatch):
+    """A request error in call_ollama stops callers from trusting the cached OK."""
+    clock, probes, results = health
+    assert ollama_client.check_ollama_health()
+
+    def refuse(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("connection refused")
+
+    monkeypatch.setattr(ollama_client.requests, "post", refuse)
+    with pytest.raises(RuntimeError):
+        ollama_client.call_ollama("こんにちは")
+
+    assert not ollama_client.check_ollama_health()
+    assert len(probes) == 1
+
+
+def test_use_cache_false_always_probes(health):
+    """use_cache=False ignores a fresh cached result."""
+    clock, probes, results = health
+
+    for _ in range(3):
+        assert ollama_client.check_ollama_health(use_cache=False)
+    assert len(probes) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
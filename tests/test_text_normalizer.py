@@ -0,0 +1,63 @@
+"""
+Unit tests for text_normalizer module.
+
+Tests cover:
+- TTS chunk splitting
+- Fast path for text that needs no normalization
+"""
+import pytest
+
+from text_normalizer import normalize_for_tts, split_into_chunks
+
+
+def test_split_short_text_is_single_chunk():
+    """Text within max_chars is returned unchanged."""
+    assert split_into_chunks("こんにちは。", max_chars=80) == ["こんにちは。"]
+    assert split_into_chunks("", max_chars=80) == []
+
+
+def test_split_prefers_sentence_end():
+    """Splits at the last 句点 inside the allowed window."""
+    text = "あ" * 25 + "。" + "い" * 25 + "、" + "う" * 40
+    chunks = split_into_chunks(text, max_chars=60, min_chars=20)
+    assert chunks[0] == "あ" * 25 + "。"
+    assert "".join(chunks) == text
+
+
+def test_split_falls_back_to_lower_priority_delimiter():
+    """Uses 読点 when no 句点 is inside the window."""
+    text = "あ" * 30 + "、" + "い" * 50
+    chunks = split_into_chunks(text, max_chars=40, min_chars=10)
+    assert chunks[0] == "あ" * 30 + "、"
+
+
+def test_split_hard_cut_without_delimiters():
+    """Cuts at max_chars when no delimiter is found."""
+    text = "あ" * 100
+    chunks = split_into_chunks(text, max_chars=40, min_chars=10)
+    assert chunks == ["あ" * 40, "あ" * 40, "あ" * 20]
+
+
+def test_split_ignores_delimiter_before_min_chars():
+    """Delimiters before min_chars are not used as split points."""
+    text = "あ。" + "い" * 60
+    chunks = split_into_chunks(text, max_chars=40, min_chars=10)
+    assert chunks[0] == ("あ。" + "い" * 60)[:40]
+
+
+def test_normalize_fast_path_returns_kana_kanji_text_unchanged():
+    """Kana/kanji text with Japanese punctuation is returned as-is."""
+    text = "今日はいい天気ですね。「そうですね」！"
+    assert normalize_for_tts(text) == text
+
+
+def test_normalize_still_converts_symbols_and_numbers():
+    """Text with characters the normalizer rewrites skips the fast path."""
+    assert normalize_for_tts("えっと…") == "えっと、"
+    assert normalize_for_tts("えっと・・・") == "えっと、"
+    assert normalize_for_tts("  はい  ") == "はい"
+    assert normalize_for_tts("50%です") == "ごじゅうパーセントです"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Unit tests for topic_history duplicate filtering.
+
+Tests cover:
+- URL matches, title keyword overlap and new topics
+- filter_duplicate_topics matches the original per-topic implementation
+"""
+import random
+
+import pytest
+
+from topic_history import filter_duplicate_topics, is_duplicate_topic
+
+
+HISTORY = {
+    "topics": [
+        {
+            "title": "OpenAI releases new reasoning model for developers",
+            "url": "https://example.com/openai-model",
+            "source_urls": ["https://example.com/source-a"],
+            "date": "2026-10-01T09:00:00",
+        },
+        {
+            "title": "Apple Vision headset sales slow down",
+            "url": "https://example.com/apple-vision",
+            "date": "2026-10-05T09:00:00",
+        },
+        {"title": "短い", "url": "https://example.com/short"},
+    ]
+}
+
+
+def _reference_is_duplicate(new_url, new_title, history):
+    """is_duplicate_topic before history lookups were precomputed."""
+    used_urls = set()
+    for topic in history.get("topics", []):
+        if "url" in topic:
+            used_urls.add(topic["url"])
+        for url in topic.get("source_urls", []):
+            used_urls.add(url)
+    used_titles = {topic["title"].lower() for topic in history.get("topics", []) if "title" in topic}
+
+    if new_url in used_urls:
+        return True
+    new_title_normalized = new_title.lower()
+    for used_title in used_titles:
+        new_keywords = set(w for w in new_title_normalized.split() if len(w) > 3)
+        used_keywords = set(w for w in used_title.split() if len(w) > 3)
+        if new_keywords and used_keywords:
+            overlap = len(new_keywords & used_keywords)
+            similarity = overlap / min(len(new_keywords), len(used_keywords))
+            if similarity > 0.8:
+                return True
+    return False
+
+
+def _reference_filter(topics, history):
+    return [
+        topic for topic in topics
+        if topic.get("is_english", False)
+        or not _reference_is_duplicate(topic.get("url", ""), topic.get("title", ""), history)
+    ]
+
+
+@pytest.mark.parametrize("url, title, expected", [
+    ("https://example.com/source-a", "Completely different story", True),  # source URL
+    ("https://example.com/new", "OPENAI Releases NEW Reasoning Model for developers", True),  # same title
+    ("https://example.com/new", "Apple Vision headset sales slow", True),  # keyword subset
+    ("https://example.com/new", "Apple headset sales recover strongly", False),  # partial overlap
+    ("https://example.com/new", "短い", False),  # no keywords longer than 3 chars
+    ("https://example.com/new", "Google announces quantum chip", False),
+])
+def test_is_duplicate_topic(url, title, expected):
+    """URL matches and >80% keyword overlap are duplicates; new topics are not."""
+    assert is_duplicate_topic(url, title, HISTORY) is expected
+    assert _reference_is_duplicate(url, title, HISTORY) is expected
+
+
+def test_filter_keeps_english_and_new_topics():
+    """Duplicates are dropped in order; English topics always pass."""
+    topics = [
+        {"title": "OpenAI releases new reasoning model", "url": "https://example.com/x"},
+        {"title": "Google announces quantum chip", "url": "https://example.com/y"},
+        {"title": "Apple Vision headset sales slow down", "url": "https://example.com/z", "is_english": True},
+        {"title": "Anything", "url": "https://example.com/apple-vision"},
+    ]
+
+    assert filter_duplicate_topics(topics, HISTORY) == topics[1:3]
+
+
+def test_filter_matches_reference_on_random_histories():
+    """The precomputed lookups give the same result as the original implementation."""
+    rng = random.Random(38)
+    words = ["openai", "model", "apple", "vision", "sales", "chip", "google", "news", "AI", "速報", "経済"]
+
+    def title():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+
+    for _ in range(200):
+        history = {"topics": [
+            {"title": title(), "url": f"https://example.com/{rng.randint(0, 20)}"}
+            for _ in range(rng.randint(0, 6))
+        ]}
+        topics = [
+            {"title": title(), "url": f"https://example.com/{rng.randint(0, 40)}", "is_english": rng.random() < 0.1}
+            for _ in range(10)
+        ]
+        assert filter_duplicate_topics(topics, history) == _reference_filter(topics, history)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,139 @@
+"""
+Unit tests for VOICEVOX chunk de-duplication.
+
+Tests cover:
+- Repeated (role, text) pairs are synthesized once and hard-linked
+- link_chunk falls back to a copy when hard links are unsupported
+- Rewriting a chunk leaves its linked duplicates untouched
+"""
+import os
+
+import pytest
+
+import audio_mastering
+import tts_generator
+import voicevox_client
+
+_generate_voice = voicevox_client.generate_voice
+
+
+class _EngineResponse:
+    """VOICEVOX HTTP response: audio_query echoes the text, synthesis returns it as audio."""
+
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode("utf-8")
+
+    def json(self):
+        return {"text": self.text}
+
+
+def _fake_engine(monkeypatch):
+    """Run the real generate_voice/_synthesize against a fake engine with the cache off."""
+    def fake_post(url, params=None, json=None, **kwargs):
+        return _EngineResponse(params.get("text") or json["text"])
+
+    monkeypatch.setattr(voicevox_client, "generate_voice", _generate_voice)
+    monkeypatch.setattr(voicevox_client, "CACHE_ENABLED", False)
+    monkeypatch.setattr(voicevox_client, "_check_cache", lambda key: None)
+    monkeypatch.setattr(voicevox_client, "preprocess_text_for_tts", None)
+    monkeypatch.setattr(voicevox_client.requests, "post", fake_post)
+
+
+@pytest.fixture
+def fake_voicevox(monkeypatch):
+    """Mock synthesis (writes "role:text" bytes), warmup, durations and mastering."""
+    synthesized = []
+
+    def fake_generate_voice(text, output_path, speaker_role="main", **kwargs):
+        synthesized.append((speaker_role, text))
+        output_path.write_bytes(f"{speaker_role}:{text}".encode("utf-8"))
+        return output_path
+
+    def fake_master_episode(chunk_paths, chunks_metadata, output_dir, **kwargs):
+        final = output_dir / "episode.mp3"
+        final.write_bytes(b"".join(path.read_bytes() for path in chunk_paths))
+        return final, [dict(meta) for meta in chunks_metadata]
+
+    monkeypatch.setattr(voicevox_client, "generate_voice", fake_generate_voice)
+    monkeypatch.setattr(voicevox_client, "warmup_speakers", lambda roles: None)
+    monkeypatch.setattr(voicevox_client, "get_audio_duration", lambda path: 1.0)
+    monkeypatch.setattr(audio_mastering, "master_episode", fake_master_episode)
+    monkeypatch.setattr(tts_generator, "USE_WHISPER_STT", False)
+    monkeypatch.setattr(tts_generator, "USE_ELEVENLABS_STT", False)
+    return synthesized
+
+
+def test_repeated_line_is_synthesized_once_and_linked(fake_voicevox, tmp_path):
+    """The second 「はい。」 from the same speaker reuses the first chunk via a hard link."""
+    dialogues = [
+        {"speaker": "男性", "text": "今日は円安の話です。"},
+        {"speaker": "女性", "text": "はい。"},
+        {"speaker": "男性", "text": "輸入物価が上がります。"},
+        {"speaker": "女性", "text": "はい。"},
+        {"speaker": "男性", "text": "はい。"},
+    ]
+
+    _, timing = tts_generator._generate_with_voicevox(dialogues, tmp_path / "audio.mp3")
+
+    chunks_dir = tmp_path / "chunks"
+    assert fake_voicevox.count(("sub", "はい。")) == 1
+    assert fake_voicevox.count(("main", "はい。")) == 1
+    assert len(fake_voicevox) == 4
+    assert os.path.samefile(chunks_dir / "chunk_0001.wav", chunks_dir / "chunk_0003.wav")
+    assert not os.path.samefile(chunks_dir / "chunk_0001.wav", chunks_dir / "chunk_0004.wav")
+    assert (chunks_dir / "chunk_0003.hash").read_text() == (chunks_dir / "chunk_0001.hash").read_text()
+    assert len(timing) == 5
+
+
+def test_link_chunk_copies_when_hard_links_fail(monkeypatch, tmp_path):
+    """Filesystems without hard links get an independent copy."""
+    src = tmp_path / "chunk_0001.wav"
+    src.write_bytes(b"audio")
+    dst = tmp_path / "chunk_0003.wav"
+
+    def no_links(src_path, dst_path):
+        raise OSError("hard links not supported")
+
+    monkeypatch.setattr(voicevox_client.os, "link", no_links)
+
+    assert voicevox_client.link_chunk(src, dst) == dst
+    assert dst.read_bytes() == b"audio"
+    assert not os.path.samefile(src, dst)
+
+
+def test_rewriting_a_chunk_keeps_linked_duplicates(fake_voicevox, monkeypatch, tmp_path):
+    """Re-synthesizing a linked chunk after its text changed does not alter the other link."""
+    _fake_engine(monkeypatch)
+    dialogues = [
+        {"speaker": "女性", "text": "はい。"},
+        {"speaker": "女性", "text": "はい。"},
+    ]
+    tts_generator._generate_with_voicevox(dialogues, tmp_path / "audio.mp3")
+    chunks_dir = tmp_path / "chunks"
+    assert os.path.samefile(chunks_dir / "chunk_0000.wav", chunks_dir / "chunk_0001.wav")
+
+    # Next run: the second line was edited, so only chunk_0001 is regenerated
+    dialogues[1] = {"speaker": "女性", "text": "そうですね。"}
+    tts_generator._generate_with_voicevox(dialogues, tmp_path / "audio.mp3")
+
+    assert (chunks_dir / "chunk_0000.wav").read_bytes() == "はい。".encode("utf-8")
+    assert (chunks_dir / "chunk_0001.wav").read_bytes() == "そうですね。".encode("utf-8")
+
+
+def test_generate_voice_unlinks_before_writing(monkeypatch, tmp_path):
+    """generate_voice replaces a hard-linked output path instead of writing through it."""
+    _fake_engine(monkeypatch)
+    original = tmp_path / "chunk_0000.wav"
+    original.write_bytes(b"old audio")
+    linked = voicevox_client.link_chunk(original, tmp_path / "chunk_0001.wav")
+
+    assert voicevox_client.generate_voice("そうですね。", linked, speaker_role="sub") == linked
+    assert linked.read_bytes() == "そうですね。".encode("utf-8")
+    assert original.read_bytes() == b"old audio"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+"""
+Unit tests for web_search module.
+
+Tests cover:
+- Serper responses are served from the on-disk cache within the TTL
+- Expired and corrupt cache entries trigger a fresh request
+- Cache keys differ by query and by LLM backend
+- Topic history is reloaded only when the history file changes
+"""
+import json
+import os
+import time
+
+import pytest
+
+import topic_history
+import web_search
+
+
+SERPER_URL = "https://google.serper.dev/news"
+
+
+class FakeResponse:
+    """requests.Response stand-in for Serper."""
+
+    ok = True
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Records Serper POSTs and answers each with a numbered payload."""
+
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, json=None, **kwargs):
+        self.calls.append((url, json))
+        return FakeResponse({"news": [{"title": f"response {len(self.calls)}"}]})
+
+
+@pytest.fixture
+def search_cache(monkeypatch, tmp_path):
+    """Point the cache at tmp_path and replace the HTTP session."""
+    session = FakeSession()
+    monkeypatch.setattr(web_search, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(web_search, "SEARCH_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(web_search, "_SESSION", session)
+    return session
+
+
+def _cache_file(tmp_path, payload):
+    key = web_search._cache_key(SERPER_URL, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+    return tmp_path / f"{key}.json"
+
+
+def test_cache_hit_within_ttl(search_cache):
+    """A repeated query inside the TTL returns the stored payload without a request."""
+    payload = {"q": "円安", "gl": "jp"}
+
+    first = web_search._post_serper(SERPER_URL, payload)
+    second = web_search._post_serper(SERPER_URL, payload)
+
+    assert second == first == {"news": [{"title": "response 1"}]}
+    assert len(search_cache.calls) == 1
+
+
+def test_expired_entry_is_refetched(search_cache, tmp_path):
+    """An entry older than SERPER_CACHE_TTL is ignored and replaced."""
+    payload = {"q": "円安", "gl": "jp"}
+    web_search._post_serper(SERPER_URL, payload)
+    expired = time.time() - web_search.SERPER_CACHE_TTL - 1
+    os.utime(_cache_file(tmp_path, payload), (expired, expired))
+
+    data = web_search._post_serper(SERPER_URL, payload)
+
+    assert data == {"news": [{"title": "response 2"}]}
+    assert len(search_cache.calls) == 2
+    assert web_search._post_serper(SERPER_URL, payload) == data
+
+
+def test_corrupt_cache_file_is_ignored(search_cache, tmp_path):
+    """A truncated cache file counts as a miss instead of raising."""
+    payload = {"q": "円安", "gl": "jp"}
+    _cache_file(tmp_path, payload).write_text('{"news": [', encoding="utf-8")
+
+    data = web_search._post_serper(SERPER_URL, payload)
+
+    assert data == {"news": [{"title": "response 1"}]}
+    assert len(search_cache.calls) == 1
+
+
+def test_cache_key_differs_by_query(search_cache):
+    """Different queries never share a cache entry."""
+    web_search._post_serper(SERPER_URL, {"q": "円安", "gl": "jp"})
+    web_search._post_serper(SERPER_URL, {"q": "金利", "gl": "jp"})
+
+    assert [payload["q"] for _, payload in search_cache.calls] == ["円安", "金利"]
+
+
+def test_topic_selection_cache_is_per_backend(search_cache, monkeypatch):
+    """A parsed topic selection is reused for the same backend only; parse failures are not cached."""
+    monkeypatch.setattr(web_search, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(web_search, "load_topic_history", lambda: {"topics": []})
+    backend = {"name": "ollama:llama"}
+    monkeypatch.setattr(web_search, "_llm_backend", lambda: backend["name"])
+    replies = ["not json", '{"selected_index": 1, "title": "円安の行方"}']
+    llm_calls = []
+
+    def fake_call_llm(prompt, max_output_tokens, temperature):
+        llm_calls.append(backend["name"])
+        return replies[min(len(llm_calls), len(replies)) - 1], backend["name"]
+
+    monkeypatch.setattr(web_search, "_call_llm", fake_call_llm)
+    results = [{"title": "円安が進行", "snippet": "為替", "url": ""}]
+
+    assert web_search.select_topic(results)["title"] == "円安が進行"  # unparseable: fallback
+    assert web_search.select_topic(results)["title"] == "円安の行方"
+    assert web_search.select_topic(results)["title"] == "円安の行方"
+    assert llm_calls == ["ollama:llama", "ollama:llama"]
+
+    backend["name"] = "gemini:flash"
+    assert web_search.select_topic(results)["title"] == "円安の行方"
+    assert llm_calls == ["ollama:llama", "ollama:llama", "gemini:flash"]
+
+
+def test_history_reloaded_when_file_mtime_changes(monkeypatch, tmp_path):
+    """_get_history reuses the cleaned history until the file's mtime changes."""
+    history_file = tmp_path / "used_topics.json"
+    monkeypatch.setattr(topic_history, "HISTORY_FILE", history_file)
+    monkeypatch.setattr(web_search, "HISTORY_FILE", history_file)
+    monkeypatch.setattr(web_search, "_HISTORY_CACHE", {"mtime": None, "value": None})
+    loads = []
+    load_topic_history = web_search.load_topic_history
+
+    def counting_load():
+        loads.append(1)
+        return load_topic_history()
+
+    monkeypatch.setattr(web_search, "load_topic_history", counting_load)
+
+    def write_history(titles, mtime):
+        topics = [{"title": t, "url": "", "date": "2099-01-01T00:00:00"} for t in titles]
+        history_file.write_text(json.dumps({"topics": topics}), encoding="utf-8")
+        os.utime(history_file, (mtime, mtime))
+
+    assert web_search._get_history() == {"topics": []}  # no file yet
+    write_history(["first"], 1_000_000)
+    assert [t["title"] for t in web_search._get_history()["topics"]] == ["first"]
+    assert [t["title"] for t in web_search._get_history()["topics"]] == ["first"]
+    assert len(loads) == 2
+
+    write_history(["first", "second"], 1_000_060)
+    assert [t["title"] for t in web_search._get_history()["topics"]] == ["first", "second"]
+    assert len(loads) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
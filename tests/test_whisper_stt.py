@@ -0,0 +1,173 @@
+"""
+Unit tests for whisper_stt script alignment.
+
+Tests cover:
+- In-order dialogues (pointer fast path)
+- A segment inserted before a dialogue (forward sweep)
+- A dialogue missing from the transcription
+- Identical alignment with and without rapidfuzz
+- Short lines stay near the pointer instead of jumping to a later repeat
+- Short lines are found past segments the previous line left unconsumed
+"""
+import pytest
+
+import whisper_stt
+from whisper_stt import align_script_with_whisper_transcription
+
+
+DIALOGUES = [
+    {"speaker": "A", "text": "今日は円安の影響について話しましょう"},
+    {"speaker": "B", "text": "輸入物価が上がって家計が苦しくなりますよね"},
+    {"speaker": "A", "text": "一方で輸出企業の業績は好調です"},
+    {"speaker": "B", "text": "結局どちらの影響が大きいのでしょうか"},
+]
+
+
+def _segments(texts):
+    """Whisper-style segments, one second each."""
+    return [
+        {"text": text, "start": float(i), "end": float(i) + 0.9}
+        for i, text in enumerate(texts)
+    ]
+
+
+def _spans(aligned):
+    return [(d["start"], d["end"]) for d in aligned]
+
+
+@pytest.fixture(params=[True, False], ids=["rapidfuzz", "difflib"])
+def scorer_backend(request, monkeypatch):
+    """Run a test with the rapidfuzz scorer and with the difflib fallback."""
+    if request.param and not whisper_stt.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(whisper_stt, "RAPIDFUZZ_AVAILABLE", request.param)
+    return request.param
+
+
+def test_in_order_dialogues_use_fast_path(scorer_backend, monkeypatch):
+    """Dialogues spoken in order (one split across two segments) align without the sweep."""
+    if scorer_backend:
+        monkeypatch.setattr(whisper_stt, "process", None)  # the sweep would fail on this
+    segments = _segments([
+        "今日は円安の影響について話しましょう",
+        "輸入物価が上がって",
+        "家計が苦しくなりますよね",
+        "一方で輸出企業の業績は好調です",
+        "結局どちらの影響が大きいのでしょうか",
+    ])
+
+    aligned = align_script_with_whisper_transcription(DIALOGUES, segments)
+
+    assert _spans(aligned) == [(0.0, 0.9), (1.0, 2.9), (3.0, 3.9), (4.0, 4.9)]
+    assert all(d["confidence"] == 1.0 for d in aligned)
+
+
+def test_inserted_segment_before_dialogue(scorer_backend, monkeypatch):
+    """Unscripted speech before a misheard dialogue is skipped over."""
+    if scorer_backend:
+        calls = []
+        extract_iter = whisper_stt.process.extract_iter
+
+        def counting_extract_iter(*args, **kwargs):
+            calls.append(1)
+            return extract_iter(*args, **kwargs)
+
+        monkeypatch.setattr(whisper_stt.process, "extract_iter", counting_extract_iter)
+    segments = _segments([
+        "今日は円安の影響について話しましょう",
+        "ここで少し宣伝をさせてください",
+        "輸入物価が上がって家計が苦しくなりますね",  # misheard: no verbatim match
+        "一方で輸出企業の業績は好調です",
+        "結局どちらの影響が大きいのでしょうか",
+    ])
+
+    aligned = align_script_with_whisper_transcription(DIALOGUES, segments)
+
+    assert _spans(aligned) == [(0.0, 0.9), (2.0, 2.9), (3.0, 3.9), (4.0, 4.9)]
+    if scorer_backend:
+        assert calls == [1]
+
+
+def test_missing_dialogue_is_estimated(scorer_backend):
+    """A dialogue absent from the transcription is placed after the previous one."""
+    segments = _segments([
+        "今日は円安の影響について話しましょう",
+        "一方で輸出企業の業績は好調です",
+        "結局どちらの影響が大きいのでしょうか",
+    ])
+
+    aligned = align_script_with_whisper_transcription(DIALOGUES, segments)
+
+    assert aligned[1]["confidence"] == 0.0
+    assert aligned[1]["start"] == pytest.approx(0.9 + 0.2)
+    assert _spans([aligned[0], aligned[2], aligned[3]]) == [(0.0, 0.9), (1.0, 1.9), (2.0, 2.9)]
+
+
+def test_fallback_scorer_gives_same_alignment(monkeypatch):
+    """Without rapidfuzz, difflib scoring produces the same spans (insertion, split, missing line)."""
+    if not whisper_stt.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    segments = _segments([
+        "今日は円安の影響について話しましょう",
+        "ここで少し宣伝をさせてください",
+        "輸入物価があがって",
+        "家計が苦しくなりますね",
+        "結局どちらの影響が大きいのでしょうか",
+    ])
+
+    with_rapidfuzz = align_script_with_whisper_transcription(DIALOGUES, segments)
+    monkeypatch.setattr(whisper_stt, "RAPIDFUZZ_AVAILABLE", False)
+    without_rapidfuzz = align_script_with_whisper_transcription(DIALOGUES, segments)
+
+    assert _spans(with_rapidfuzz)[:2] == [(0.0, 0.9), (2.0, 3.9)]
+    assert _spans(without_rapidfuzz) == _spans(with_rapidfuzz)
+
+
+def test_short_line_does_not_jump_to_later_repeat(scorer_backend):
+    """A short reply behind a lagging pointer takes its nearby misheard copy, not an exact repeat far ahead."""
+    dialogues = [
+        {"speaker": "A", "text": "今日は経済の話をしましょう"},
+        {"speaker": "B", "text": "そうですね"},
+        {"speaker": "A", "text": "まずは金利の話から始めます"},
+    ]
+    segments = _segments([
+        "今日は経済の話を",
+        "しましょう",
+        "えーと",
+        "それでは",
+        "そうですよね",
+        "まずは金利の話から始めます",
+        "日銀は政策金利を据え置きました",
+        "そうですね",
+    ])
+
+    aligned = align_script_with_whisper_transcription(dialogues, segments)
+
+    assert _spans(aligned) == [(0.0, 1.9), (4.0, 4.9), (5.0, 5.9)]
+
+
+def test_short_line_after_unconsumed_segments(scorer_backend):
+    """A short line several segments past the pointer is still found and keeps later lines aligned."""
+    dialogues = [
+        {"speaker": "A", "text": "今日は経済の話をしましょう"},
+        {"speaker": "B", "text": "はい"},
+        {"speaker": "A", "text": "まずは金利の話から始めます"},
+    ]
+    segments = _segments([
+        "今日は経済の話を",
+        "しましょう",
+        "えーと",
+        "あのー",
+        "ですから",
+        "はい",
+        "まずは金利の話から始めます",
+    ])
+
+    aligned = align_script_with_whisper_transcription(dialogues, segments)
+
+    assert _spans(aligned) == [(0.0, 1.9), (5.0, 5.9), (6.0, 6.9)]
+    assert aligned[1]["confidence"] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+"""
+Unit tests for youtube_uploader module.
+
+Tests cover:
+- Batch uploads keep every request off the shared service transport
+- Comments are posted in order by default
+- Only idempotent requests are retried
+- Thumbnail MIME types are sniffed from magic bytes
+"""
+import itertools
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+httplib2 = pytest.importorskip("httplib2")
+
+from googleapiclient.discovery import build
+from google.oauth2.credentials import Credentials
+
+import youtube_uploader
+
+
+class FakeHttp:
+    """httplib2.Http stand-in answering every YouTube call with a new resource ID."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, log):
+        self.log = log
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if hasattr(body, "read"):
+            body.read()
+        self.log.append((threading.get_ident(), method, uri))
+        if "uploadType=resumable" in uri:
+            return httplib2.Response({"status": "200", "location": "https://upload.example/session"}), b""
+        return httplib2.Response({"status": "200"}), json.dumps({"id": f"ID{next(self._ids)}"}).encode()
+
+
+class SharedTransportSpy:
+    """Inner transport of the cached service: any request on it is a thread-safety bug."""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, uri, *args, **kwargs):
+        self.calls.append(uri)
+        raise AssertionError("request sent over the shared service transport")
+
+
+@pytest.fixture
+def mocked_service(monkeypatch):
+    """Cached service whose shared transport is a spy, plus per-thread fake transports."""
+    service = build(
+        "youtube", "v3", credentials=Credentials(token="token"),
+        static_discovery=True, cache_discovery=False
+    )
+    shared = SharedTransportSpy()
+    service._http.http = shared
+
+    thread_log = []
+    local = threading.local()
+
+    def fake_thread_http(credentials):
+        if not hasattr(local, "http"):
+            local.http = FakeHttp(thread_log)
+        return local.http
+
+    monkeypatch.setattr(youtube_uploader, "authenticate_youtube", lambda: service)
+    monkeypatch.setattr(youtube_uploader, "_thread_http", fake_thread_http)
+    monkeypatch.setattr(youtube_uploader, "_YT_SERVICE", None)
+    monkeypatch.setattr(youtube_uploader, "_SNIPPET_CACHE", {})
+    youtube_uploader._POSTED_COMMENTS.clear()
+    return service, shared, thread_log
+
+
+def test_batch_upload_never_uses_shared_transport(mocked_service, tmp_path):
+    """Two concurrent jobs with thumbnail + one comment each stay on per-thread transports."""
+    service, shared, thread_log = mocked_service
+    jobs = []
+    for n in range(2):
+        video = tmp_path / f"video_{n}.mp4"
+        video.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"0" * 64)
+        thumb = tmp_path / f"thumb_{n}.jpg"
+        thumb.write_bytes(b"\xff\xd8\xff\xe0" + b"0" * 16)
+        jobs.append({
+            "video_path": str(video),
+            "metadata": {"title": f"Video {n}"},
+            "thumbnail_path": str(thumb),
+            "comments": [f"comment for video {n}"],
+        })
+
+    results = youtube_uploader.upload_videos_batch(jobs, workers=2)
+
+    assert all(result and result["video_id"] for result in results)
+    assert shared.calls == []
+    uris = [uri for _, _, uri in thread_log]
+    assert sum("uploadType=resumable" in uri for uri in uris) == 2
+    assert sum("/thumbnails/set" in uri for uri in uris) == 2
+    assert sum("/commentThreads" in uri for uri in uris) == 2
+
+
+def test_update_metadata_uses_thread_transport(mocked_service):
+    """update_video_metadata's list + update calls avoid the shared transport."""
+    service, shared, thread_log = mocked_service
+    # Fake list response has no items, so also cover the cached-snippet path
+    youtube_uploader._SNIPPET_CACHE["VID"] = {"title": "old", "categoryId": "22"}
+
+    assert youtube_uploader.update_video_metadata(service, "VID", title="new")
+    assert shared.calls == []
+    assert any("/videos" in uri for _, _, uri in thread_log)
+
+
+def test_post_comments_keeps_order_by_default(mocked_service, monkeypatch):
+    """With the default single worker, comments are inserted in the order given."""
+    service, shared, thread_log = mocked_service
+    comments = [f"comment {n}" for n in range(5)]
+    sent = []
+    original = youtube_uploader._post_one_comment
+
+    def recording_post(youtube, video_id, comment_text, credentials=None):
+        sent.append(comment_text)
+        return original(youtube, video_id, comment_text, credentials)
+
+    monkeypatch.setattr(youtube_uploader, "_post_one_comment", recording_post)
+
+    assert youtube_uploader.post_comments(service, "VID", comments) == 5
+    assert sent == comments
+    assert shared.calls == []
+
+
+def test_only_idempotent_requests_are_retried(mocked_service, monkeypatch, tmp_path):
+    """A 503 is retried for thumbnails.set but never for comment/playlist inserts."""
+    service, shared, thread_log = mocked_service
+    monkeypatch.setattr("googleapiclient.http.time.sleep", lambda seconds: None)
+    failed_once = set()
+
+    def flaky_request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.log.append((threading.get_ident(), method, uri))
+        path = uri.split("?")[0]
+        if path not in failed_once:
+            failed_once.add(path)
+            return httplib2.Response({"status": "503"}), b""
+        return httplib2.Response({"status": "200"}), b'{"id": "ID"}'
+
+    monkeypatch.setattr(FakeHttp, "request", flaky_request)
+    credentials = service._http.credentials
+    thumb = tmp_path / "thumb.jpg"
+    thumb.write_bytes(b"\xff\xd8\xff\xe0" + b"0" * 16)
+
+    youtube_uploader._set_thumbnail(service, "VID", str(thumb), credentials)
+    youtube_uploader._add_to_playlist(service, "VID", "PL", credentials)
+    assert youtube_uploader.post_comments(service, "VID", ["hello"], credentials) == 0
+
+    uris = [uri for _, _, uri in thread_log]
+    assert sum("/thumbnails/set" in uri for uri in uris) == 2
+    assert sum("/playlistItems" in uri for uri in uris) == 1
+    assert sum("/commentThreads" in uri for uri in uris) == 1
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff\xe0", "image/jpeg"),
+    (b"\x00\x00\x00\x1cftypavif", "image/avif"),
+    (b"\x00\x00\x00\x18ftypheic", "image/heic"),
+    (b"\x00\x00\x00\x18ftypmp42", "image/jpeg"),  # video, not a thumbnail
+    (b"GIF89a", "image/jpeg"),
+])
+def test_sniff_image_mime(tmp_path, head, expected):
+    """PNG/JPEG and AVIF/HEIC ftyp brands are detected; anything else gets the default."""
+    path = tmp_path / "thumbnail.jpg"
+    path.write_bytes(head + b"\x00" * 16)
+
+    assert youtube_uploader._sniff_image_mime(str(path), "image/jpeg") == expected
+
+
+def test_sniff_image_mime_missing_file(tmp_path):
+    """An unreadable file falls back to the default."""
+    assert youtube_uploader._sniff_image_mime(str(tmp_path / "missing.jpg"), "image/jpeg") == "image/jpeg"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -255,6 +255,16 @@ def _normalize_model_versions(text: str) -> str:
     return text
 
 
+# 正規化で変化しない文字だけのテキスト（かな・漢字・和文句読点）を判定
+# ・ (U+30FB) と … は normalize_symbols で置換されるため含めない
+_TTS_READY_RE = re.compile(r'[\u3041-\u309f\u30a0-\u30fa\u30fc-\u30ff\u4e00-\u9fff々、。！？「」]+')
+
+
+def _is_already_tts_ready(text: str) -> bool:
+    """数字・記号・英字・空白を含まず、正規化が不要なテキストか"""
+    return _TTS_READY_RE.fullmatch(text) is not None
+
+
 def normalize_for_tts(text: str) -> str:
     """
     TTS用にテキストを正規化（メイン関数）
@@ -266,7 +276,7 @@ def normalize_for_tts(text: str) -> str:
     4. 大きな数値の変換
     5. 記号の変換
     """
-    if not text:
+    if not text or _is_already_tts_ready(text):
         return text
 
     # Step 1: HTMLエンティティをデコード
@@ -290,6 +300,20 @@ def normalize_for_tts(text: str) -> str:
 # テキスト分割（長文対応）
 # ============================================
 
+# 分割優先度（順に試行）
+_SPLIT_DELIMITERS = (
+    '。',   # 句点
+    '！',   # 感嘆符
+    '？',   # 疑問符
+    '、',   # 読点
+    '）',   # 閉じ括弧
+    '」',   # 閉じ鉤括弧
+    '\n',  # 改行
+    '　',   # 全角スペース
+    ' ',    # 半角スペース
+)
+
+
 def split_into_chunks(text: str, max_chars: int = 80, min_chars: int = 20) -> List[str]:
     """
     テキストをTTS用のチャンクに分割
@@ -307,29 +331,18 @@ def split_into_chunks(text: str, max_chars: int = 80, min_chars: int = 20) -> Li
 
     chunks = []
     remaining = text.strip()
-
-    # 分割優先度（順に試行）
-    split_patterns = [
-        r'。',  # 句点
-        r'！',  # 感嘆符
-        r'？',  # 疑問符
-        r'、',  # 読点
-        r'）',  # 閉じ括弧
-        r'」',  # 閉じ鉤括弧
-        r'\n',  # 改行
-        r'　',  # 全角スペース
-        r' ',   # 半角スペース
-    ]
+    search_start = max(min_chars - 1, 0)
 
     while len(remaining) > max_chars:
         best_split = -1
 
-        for pattern in split_patterns:
-            for i in range(min(max_chars, len(remaining)), min_chars - 1, -1):
-                if re.match(pattern, remaining[i-1:i]):
-                    best_split = i
-                    break
-            if best_split > 0:
+        # 区切り文字ごとに [min_chars, max_chars] 内の最も後ろの位置を探す
+        # （str.rfind は C 実装のため1文字ずつの正規表現マッチより高速）
+        search_end = min(max_chars, len(remaining))
+        for delimiter in _SPLIT_DELIMITERS:
+            pos = remaining.rfind(delimiter, search_start, search_end)
+            if pos >= 0:
+                best_split = pos + 1
                 break
 
         if best_split <= 0:
@@ -79,6 +79,44 @@ def get_used_titles(history: Dict) -> Set[str]:
     return titles
 
 
+def _used_keyword_sets(history: Dict) -> List[Set[str]]:
+    """Keyword sets (words longer than 3 chars) of every used title, computed once per history"""
+    return [
+        set(w for w in used_title.split() if len(w) > 3)
+        for used_title in get_used_titles(history)
+    ]
+
+
+def _is_duplicate(
+    new_url: str,
+    new_title: str,
+    used_urls: Set[str],
+    used_keyword_sets: List[Set[str]]
+) -> bool:
+    """Duplicate check against precomputed history URL/keyword sets"""
+    # Check URL match
+    if new_url in used_urls:
+        return True
+
+    # Check title similarity (simple keyword overlap)
+    # Extract keywords (simple split by space, filter short words)
+    new_keywords = set(w for w in new_title.lower().split() if len(w) > 3)
+    if not new_keywords:
+        return False
+
+    # If 70%+ keywords overlap, consider duplicate
+    # Use 80% threshold for AI news to allow more variety
+    threshold = 0.8
+    for used_keywords in used_keyword_sets:
+        if used_keywords:
+            overlap = len(new_keywords & used_keywords)
+            similarity = overlap / min(len(new_keywords), len(used_keywords))
+            if similarity > threshold:
+                return True
+
+    return False
+
+
 def is_duplicate_topic(new_url: str, new_title: str, history: Dict) -> bool:
     """
     Check if a topic is a duplicate based on URL or title similarity
@@ -91,30 +129,7 @@ def is_duplicate_topic(new_url: str, new_title: str, history: Dict) -> bool:
     Returns:
         True if duplicate, False otherwise
     """
-    used_urls = get_used_urls(history)
-    used_titles = get_used_titles(history)
-
-    # Check URL match
-    if new_url in used_urls:
-        return True
-
-    # Check title similarity (simple keyword overlap)
-    new_title_normalized = new_title.lower()
-    for used_title in used_titles:
-        # Extract keywords (simple split by space, filter short words)
-        new_keywords = set(w for w in new_title_normalized.split() if len(w) > 3)
-        used_keywords = set(w for w in used_title.split() if len(w) > 3)
-
-        # If 70%+ keywords overlap, consider duplicate
-        # Use 80% threshold for AI news to allow more variety
-        threshold = 0.8
-        if new_keywords and used_keywords:
-            overlap = len(new_keywords & used_keywords)
-            similarity = overlap / min(len(new_keywords), len(used_keywords))
-            if similarity > threshold:
-                return True
-
-    return False
+    return _is_duplicate(new_url, new_title, get_used_urls(history), _used_keyword_sets(history))
 
 
 def filter_duplicate_topics(topics: List[Dict], history: Dict) -> List[Dict]:
@@ -128,6 +143,10 @@ def filter_duplicate_topics(topics: List[Dict], history: Dict) -> List[Dict]:
     Returns:
         Filtered list of non-duplicate topics
     """
+    # Build the history lookups once instead of once per topic
+    used_urls = get_used_urls(history)
+    used_keyword_sets = _used_keyword_sets(history)
+
     filtered = []
     for topic in topics:
         url = topic.get("url", "")
@@ -140,7 +159,7 @@ def filter_duplicate_topics(topics: List[Dict], history: Dict) -> List[Dict]:
             filtered.append(topic)
             continue
 
-        if not is_duplicate_topic(url, title, history):
+        if not _is_duplicate(url, title, used_urls, used_keyword_sets):
             filtered.append(topic)
         else:
             print(f"  Skipping duplicate topic: {title[:50]}...")
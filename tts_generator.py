@@ -6,6 +6,7 @@ Fallback: Gemini TTS (API, paid) → gTTS (basic fallback)
 Enhanced with accurate subtitle timing via Whisper STT.
 """
 import os
+import re
 import json
 import subprocess
 from pathlib import Path
@@ -22,6 +23,9 @@ USE_VOICEVOX = os.getenv("USE_VOICEVOX", "true").lower() == "true"
 # Gemini TTS control (separate from GEMINI_API_KEY to allow script generation but skip TTS)
 USE_GEMINI_TTS = os.getenv("USE_GEMINI_TTS", "true").lower() == "true"
 
+# chunk_0001.wav / chunk_0001.hash in the persistent VOICEVOX chunks dir
+_CHUNK_FILE_RE = re.compile(r"chunk_(\d+)\.(wav|hash)")
+
 # Lazy evaluation - only check VOICEVOX when actually needed
 _voicevox_available_cached = None
 _voicevox_checked = False
@@ -140,15 +144,28 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
     print("[TTS] Using VOICEVOX for synthesis...")
 
     chunk_paths = []
+    # One record per successful chunk: feeds mastering, Whisper alignment
+    # (speaker/original text) and the chunk_id restore below.
     chunks_metadata = []
-    timing_data = []
-    successful_dialogues = []
     current_time = 0.0
 
     # P0 Fix: Use persistent chunks directory for idempotency
     chunks_dir = output_path.parent / "chunks"
     chunks_dir.mkdir(exist_ok=True)
 
+    # Single directory pass instead of exists()+stat() per chunk
+    existing_chunk_sizes, existing_hash_ids = _scan_chunks_dir(chunks_dir)
+
+    # Load speaker models before the loop so the first chunk of each voice is not cold
+    voicevox_client.warmup_speakers({
+        voicevox_client._speaker_label_to_role(d.get("speaker", "男性"))
+        for d in dialogues
+    })
+
+    # (speaker_role, text) -> first chunk synthesized for it in this episode.
+    # Repeated short phrases (はい。/そうですね。) are linked instead of re-synthesized.
+    synthesized_chunks: Dict[Tuple[str, str], Path] = {}
+
     for idx, dialogue in enumerate(dialogues):
         text = dialogue.get("text", "").strip()
         speaker = dialogue.get("speaker", "男性")
@@ -158,7 +175,7 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
         text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
         
         # Role-based mapping (Main/Sub)
-        speaker_role = "sub" if speaker in ["女性", "B", "Female", "Sub"] else "main"
+        speaker_role = voicevox_client._speaker_label_to_role(speaker)
 
         # Consistent naming for idempotency
         # Include hash in filename or use sidecar file to verify
@@ -168,15 +185,21 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
 
         # Idempotency: Check if chunk already exists AND matches the text hash
         is_valid_cache = False
-        if chunk_path.exists() and chunk_path.stat().st_size > 0 and hash_path.exists():
+        if existing_chunk_sizes.get(idx, 0) > 0 and idx in existing_hash_ids:
             with open(hash_path, "r") as f:
                 cached_hash = f.read().strip()
                 if cached_hash == text_hash:
                     is_valid_cache = True
 
+        dedup_key = (speaker_role, text)
+
         if is_valid_cache:
             # print(f"[TTS] Reusing valid chunk {idx}")
             result = chunk_path
+        elif dedup_key in synthesized_chunks:
+            result = voicevox_client.link_chunk(synthesized_chunks[dedup_key], chunk_path)
+            with open(hash_path, "w") as f:
+                f.write(text_hash)
         else:
             # print(f"[TTS] Generating fresh chunk {idx}")
             result = voicevox_client.generate_voice(
@@ -190,6 +213,7 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
                     f.write(text_hash)
 
         if result:
+            synthesized_chunks.setdefault(dedup_key, chunk_path)
             duration = voicevox_client.get_audio_duration(chunk_path)
             # Metadata for this successful chunk
             chunk_meta = {
@@ -199,21 +223,15 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
                 "start": current_time,
                 "end": current_time + duration,
             }
+            # "text" holds the ORIGINAL text: Whisper alignment uses it for
+            # the final subtitle content.
             chunks_metadata.append(chunk_meta)
-            timing_data.append(chunk_meta)
-            
-            # For Whisper alignment, we need the ORIGINAL text for subtitles,
-            # but we also need to keep the normalized text for audio matching if needed.
-            # Whisper alignment uses 'text' field for the final subtitle content.
-            successful_dialogues.append({
-                "speaker": speaker,
-                "text": dialogue.get("original_text", text),
-            })
-            
+
             current_time += duration
             chunk_paths.append(chunk_path)
         else:
             print(f"[TTS] Warning: Failed to generate chunk {idx} - SKIPPING")
+        voicevox_client.print_progress(idx + 1, len(dialogues), prefix="[TTS]")
 
     if not chunk_paths:
         print("[TTS] No chunks generated, falling back to gTTS")
@@ -245,21 +263,44 @@ def _generate_with_voicevox(dialogues: List[Dict], output_path: Path) -> Tuple[P
     print("[TTS] Aligning subtitles with final audio...")
     if USE_WHISPER_STT or USE_ELEVENLABS_STT:
         # VOICEVOX produces human-like voices, so is_synthetic=False
-        timing_result = _get_accurate_timing(successful_dialogues, final_mp3, adjusted_timing, is_synthetic=False)
+        timing_result = _get_accurate_timing(chunks_metadata, final_mp3, adjusted_timing, is_synthetic=False)
     else:
         print("[TTS] Using calculated timing (Whisper disabled)")
         timing_result = adjusted_timing
     
     # Add chunk_ids back to timing result if lost during mastering adjustment
     # (Assuming simple 1:1 mapping for now, though mastering might shift things)
-    if len(timing_result) == len(timing_data):
-        for t_res, t_orig in zip(timing_result, timing_data):
+    if len(timing_result) == len(chunks_metadata):
+        for t_res, t_orig in zip(timing_result, chunks_metadata):
             t_res["chunk_id"] = t_orig.get("chunk_id")
 
     print(f"[TTS] VOICEVOX generation complete: {final_mp3}")
     return final_mp3, timing_result
 
 
+def _scan_chunks_dir(chunks_dir: Path) -> Tuple[Dict[int, int], set]:
+    """
+    Scan a persistent chunks directory once.
+
+    Returns:
+        Tuple of ({chunk_idx: wav size in bytes}, {chunk_idx with a .hash sidecar})
+    """
+    chunk_sizes = {}
+    hash_ids = set()
+    with os.scandir(chunks_dir) as entries:
+        for entry in entries:
+            match = _CHUNK_FILE_RE.fullmatch(entry.name)
+            if not match:
+                continue
+            chunk_idx = int(match.group(1))
+            suffix = match.group(2)
+            if suffix == "wav":
+                chunk_sizes[chunk_idx] = entry.stat().st_size
+            elif suffix == "hash":
+                hash_ids.add(chunk_idx)
+    return chunk_sizes, hash_ids
+
+
 def _generate_with_gemini(dialogues: List[Dict], output_path: Path) -> Tuple[Path, List[Dict]]:
     """Generate audio using Gemini TTS API."""
     import base64
@@ -531,8 +572,6 @@ def _improve_estimated_timing(
     if actual_duration is None:
         return timing_data
 
-    # Calculate total estimated duration
-    total_estimated = sum(t["end"] - t["start"] for t in timing_data)
     last_end = timing_data[-1]["end"] if timing_data else 0
 
     # Scale timing if mismatch
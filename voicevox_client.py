@@ -13,6 +13,11 @@ from typing import Optional, Dict, List, Tuple, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    from english_to_katakana import preprocess_text_for_tts
+except ImportError:
+    preprocess_text_for_tts = None
+
 # Configuration
 VOICEVOX_URL = os.getenv("VOICEVOX_URL", "http://voicevox:50021")
 
@@ -76,6 +81,9 @@ CACHE_ENABLED = os.getenv("VOICEVOX_CACHE_ENABLED", "true").lower() == "true"
 MAX_RETRIES = int(os.getenv("VOICEVOX_MAX_RETRIES", "3"))
 RETRY_DELAY = float(os.getenv("VOICEVOX_RETRY_DELAY", "2.0"))
 
+# Per-chunk logging ("Generated"/"Cache hit"); otherwise only throttled progress is printed
+VERBOSE = os.getenv("VOICEVOX_VERBOSE", "false").lower() == "true"
+
 # Request timeout (seconds)
 AUDIO_QUERY_TIMEOUT = int(os.getenv("VOICEVOX_QUERY_TIMEOUT", "30"))
 SYNTHESIS_TIMEOUT = int(os.getenv("VOICEVOX_SYNTHESIS_TIMEOUT", "120"))
@@ -88,35 +96,38 @@ class TTSMetrics:
     successful_chunks: int = 0
     failed_chunks: int = 0
     cache_hits: int = 0
+    deduplicated_chunks: int = 0
     total_generation_time: float = 0.0
     generation_times: List[float] = field(default_factory=list)
     normalized_words: List[str] = field(default_factory=list)
 
+    @staticmethod
+    def _percentile(sorted_times: List[float], fraction: float) -> float:
+        if not sorted_times:
+            return 0.0
+        idx = int(len(sorted_times) * fraction)
+        return sorted_times[min(idx, len(sorted_times) - 1)]
+
     @property
     def p50(self) -> float:
-        if not self.generation_times:
-            return 0.0
-        sorted_times = sorted(self.generation_times)
-        idx = len(sorted_times) // 2
-        return sorted_times[idx]
+        return self._percentile(sorted(self.generation_times), 0.5)
 
     @property
     def p95(self) -> float:
-        if not self.generation_times:
-            return 0.0
-        sorted_times = sorted(self.generation_times)
-        idx = int(len(sorted_times) * 0.95)
-        return sorted_times[min(idx, len(sorted_times) - 1)]
+        return self._percentile(sorted(self.generation_times), 0.95)
 
     def to_dict(self) -> Dict:
+        # Sort once for both percentiles
+        sorted_times = sorted(self.generation_times)
         return {
             "total_chunks": self.total_chunks,
             "successful_chunks": self.successful_chunks,
             "failed_chunks": self.failed_chunks,
             "cache_hits": self.cache_hits,
+            "deduplicated_chunks": self.deduplicated_chunks,
             "total_generation_time_sec": round(self.total_generation_time, 2),
-            "p50_ms": round(self.p50 * 1000, 1),
-            "p95_ms": round(self.p95 * 1000, 1),
+            "p50_ms": round(self._percentile(sorted_times, 0.5) * 1000, 1),
+            "p95_ms": round(self._percentile(sorted_times, 0.95) * 1000, 1),
             "normalized_words_count": len(self.normalized_words),
         }
 
@@ -164,6 +175,54 @@ def get_speakers() -> List[Dict]:
     return []
 
 
+def _role_to_speaker_id(speaker_role: str) -> int:
+    """Map a speaker role/type ('main', 'sub', legacy 'male'/'female') to a speaker ID."""
+    # Normalized to lowercase for comparison
+    role = str(speaker_role).lower()
+
+    if role in ["sub", "b", "female", "woman", "女性", "assistant"]:
+        return NARRATOR_SUB
+    # Default to MAIN for "main", "a", "male", "man", "男性", or unknown
+    return NARRATOR_MAIN
+
+
+def warmup(speaker_role: str = "main") -> bool:
+    """
+    Preload the voice model for a speaker so the first synthesis is not cold.
+
+    Args:
+        speaker_role: 'main' or 'sub' (legacy 'male'/'female' also accepted).
+
+    Returns:
+        True if the engine acknowledged the initialization.
+    """
+    speaker_id = _role_to_speaker_id(speaker_role)
+    try:
+        response = requests.post(
+            f"{VOICEVOX_URL}/initialize_speaker",
+            params={"speaker": speaker_id, "skip_reinit": "true"},
+            timeout=AUDIO_QUERY_TIMEOUT,
+        )
+        return response.status_code in (200, 204)
+    except Exception as e:
+        print(f"[VOICEVOX] Warmup failed for speaker {speaker_id}: {e}")
+        return False
+
+
+def warmup_speakers(speaker_roles) -> None:
+    """Warm up several speaker roles in parallel (one request per unique speaker ID)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    roles_by_id = {}
+    for role in speaker_roles:
+        roles_by_id.setdefault(_role_to_speaker_id(role), role)
+    if not roles_by_id:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(roles_by_id)) as executor:
+        list(executor.map(warmup, roles_by_id.values()))
+
+
 def _get_cache_key(
     text: str,
     speaker_id: int,
@@ -226,15 +285,7 @@ def generate_voice(
     if speaker_type:
         speaker_role = speaker_type
 
-    # Map roles/types to IDs
-    # Normalized to lowercase for comparison
-    role = str(speaker_role).lower()
-    
-    if role in ["sub", "b", "female", "woman", "女性", "assistant"]:
-        speaker_id = NARRATOR_SUB
-    else:
-        # Default to MAIN for "main", "a", "male", "man", "男性", or unknown
-        speaker_id = NARRATOR_MAIN
+    speaker_id = _role_to_speaker_id(speaker_role)
 
     # Check cache first
     cache_key = _get_cache_key(text, speaker_id, speed_scale, pitch_scale, intonation_scale)
@@ -243,10 +294,13 @@ def generate_voice(
         # Copy from cache to output path
         import shutil
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unlink first: output_path may be a hard link shared with another chunk
+        output_path.unlink(missing_ok=True)
         shutil.copy(cached_path, output_path)
         _metrics.cache_hits += 1
         _metrics.successful_chunks += 1
-        print(f"[VOICEVOX] Cache hit for '{text[:20]}...'")
+        if VERBOSE:
+            print(f"[VOICEVOX] Cache hit for '{text[:20]}...'")
         return output_path
 
     # Generate with retry
@@ -300,11 +354,7 @@ def _synthesize(
     """Internal synthesis function without retry logic."""
     # Preprocess text: convert English words to katakana for natural pronunciation
     # This handles common English names and tech terms automatically
-    try:
-        from english_to_katakana import preprocess_text_for_tts
-        processed_text = preprocess_text_for_tts(text)
-    except ImportError:
-        processed_text = text
+    processed_text = preprocess_text_for_tts(text) if preprocess_text_for_tts else text
 
     # Step 1: Create Audio Query
     params = {"text": processed_text, "speaker": speaker_id}
@@ -336,15 +386,48 @@ def _synthesize(
     if synthesis_response.status_code != 200:
         raise RuntimeError(f"synthesis failed: {synthesis_response.text}")
 
-    # Step 3: Save to file
+    # Step 3: Save to file (unlink first so hard-linked duplicates are not overwritten)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.unlink(missing_ok=True)
     with open(output_path, "wb") as f:
         f.write(synthesis_response.content)
 
-    print(f"[VOICEVOX] Generated: {output_path.name} (speaker={speaker_id})")
+    if VERBOSE:
+        print(f"[VOICEVOX] Generated: {output_path.name} (speaker={speaker_id})")
     return output_path
 
 
+def print_progress(current: int, total: int, prefix: str = "[VOICEVOX]") -> None:
+    """Print chunk progress roughly every 5% instead of once per chunk."""
+    if total <= 0:
+        return
+    if current % max(1, total // 20) == 0 or current == total:
+        print(f"{prefix} Chunks {current}/{total} ({current * 100 // total}%)")
+
+
+def _speaker_label_to_role(speaker: str) -> str:
+    """Map a dialogue speaker label (男性/女性/A/B...) to a synthesis role."""
+    return "sub" if speaker in ["女性", "B", "Female", "Sub"] else "main"
+
+
+def link_chunk(src: Path, dst: Path) -> Path:
+    """
+    Materialize an already-synthesized chunk at another path.
+
+    Uses a hard link (no bytes copied) and falls back to a regular copy
+    when the filesystem does not support links.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        import shutil
+        shutil.copy(src, dst)
+    return dst
+
+
 def generate_dialogue_chunks(
     dialogues: List[Dict],
     output_dir: Path,
@@ -353,6 +436,9 @@ def generate_dialogue_chunks(
     """
     Generate audio chunks for dialogue segments.
 
+    Identical (speaker, text) pairs are synthesized only once; the remaining
+    chunks of the group are hard-linked to the first result.
+
     Args:
         dialogues: List of {"speaker": "男性/女性", "text": "...", "chunk_id": int}
         output_dir: Directory to save chunk files.
@@ -369,22 +455,42 @@ def generate_dialogue_chunks(
 
     total = len(dialogues)
 
+    # Group chunk ids by (role, text) so each unique utterance hits VOICEVOX once
+    unique_map: Dict[Tuple[str, str], List[int]] = {}
+    entries = []
     for idx, dialogue in enumerate(dialogues):
         text = dialogue.get("text", "").strip()
         if not text:
             continue
-
         speaker = dialogue.get("speaker", "男性")
-        # Map speaker label to role
-        speaker_role = "sub" if speaker in ["女性", "B", "Female", "Sub"] else "main"
         chunk_id = dialogue.get("chunk_id", idx)
+        key = (_speaker_label_to_role(speaker), text)
+        unique_map.setdefault(key, []).append(chunk_id)
+        entries.append((idx, chunk_id, speaker, key))
+
+    if len(unique_map) < len(entries):
+        print(f"[VOICEVOX] {len(entries) - len(unique_map)} duplicate chunks will be reused")
+
+    # Load speaker models up front so the first chunk of each voice is not cold
+    warmup_speakers({role for role, _ in unique_map})
 
+    synthesized: Dict[Tuple[str, str], Optional[Path]] = {}
+
+    for done, (idx, chunk_id, speaker, key) in enumerate(entries, 1):
+        speaker_role, text = key
         chunk_path = output_dir / f"chunk_{chunk_id:04d}.wav"
 
         if on_progress:
             on_progress(idx, total, "generating")
 
-        result = generate_voice(text, chunk_path, speaker_role=speaker_role)
+        if key in synthesized:
+            source = synthesized[key]
+            result = link_chunk(source, chunk_path) if source else None
+            if result:
+                _metrics.deduplicated_chunks += 1
+        else:
+            result = generate_voice(text, chunk_path, speaker_role=speaker_role)
+            synthesized[key] = result
 
         if result:
             chunk_paths.append(result)
@@ -395,6 +501,7 @@ def generate_dialogue_chunks(
                 "text": text,
                 "error": "synthesis_failed",
             })
+        print_progress(done, len(entries))
 
     if on_progress:
         on_progress(total, total, "complete")
@@ -6,10 +6,19 @@ Now supports local LLM via Ollama for topic selection
 import os
 import json
 import re
+import time
+import hashlib
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+from pathlib import Path
 from topic_history import (
+    HISTORY_FILE,
     load_topic_history,
     filter_duplicate_topics,
     clean_old_history
@@ -22,18 +31,101 @@ try:
 except ImportError:
     USE_RSS_FEED = False
 
+# Optional Aho-Corasick automaton for entity extraction (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Ollama integration
 try:
-    from ollama_client import call_ollama, check_ollama_health
+    from ollama_client import call_ollama, check_ollama_health, OLLAMA_MODEL
     USE_OLLAMA = os.getenv("USE_OLLAMA", "true").lower() == "true"
 except ImportError:
     USE_OLLAMA = False
+    OLLAMA_MODEL = None
     print("[WARNING] ollama_client not found. Ollama integration disabled.")
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")  # Google Search API alternative
 
+# Shared session: reuses TCP/TLS connections to Serper/Gemini across calls and
+# retries transient failures (connection errors, 429, 5xx) with backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False,
+    ),
+))
+
+# Short-lived on-disk cache for Serper responses and LLM topic selection.
+# Repeated runs within minutes (retries, multiple videos) reuse identical requests.
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_DIR = Path(os.getenv("SEARCH_CACHE_DIR", "/tmp/web_search_cache"))
+SERPER_CACHE_TTL = int(os.getenv("SERPER_CACHE_TTL", "900"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+
+
+def _cache_key(*parts: Any) -> str:
+    """Hash request parameters into a cache file name."""
+    key_data = "|".join(str(p) for p in parts)
+    return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str, ttl: int) -> Optional[Any]:
+    """Return the cached value if present and younger than ttl seconds."""
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    cache_path = SEARCH_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime > ttl:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_set(key: str, value: Any) -> None:
+    """Store a JSON-serializable value (atomic rename; failures are ignored)."""
+    if not SEARCH_CACHE_ENABLED:
+        return
+    try:
+        SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path = SEARCH_CACHE_DIR / f"{key}.json"
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[Search] Cache write failed: {e}")
+
+
+def _post_serper(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST a Serper query through the shared session, reusing a recent identical response."""
+    key = _cache_key(url, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+    cached = _cache_get(key, SERPER_CACHE_TTL)
+    if cached is not None:
+        print("[Search] Using cached Serper response")
+        return cached
+
+    headers = {
+        "X-API-KEY": SERPER_API_KEY,
+        "Content-Type": "application/json"
+    }
+    response = _SESSION.post(url, json=payload, headers=headers, timeout=30)
+    data = response.json()
+    if response.ok:
+        _cache_set(key, data)
+    return data
+
 # High-priority entities that frequently boost CTR when highlighted in titles
 NAMED_ENTITY_LIBRARY = [
     {
@@ -117,15 +209,55 @@ NAMED_ENTITY_LIBRARY = [
 ]
 
 
+def _build_alias_automaton():
+    """Build one automaton over every lowercased alias (None if pyahocorasick is missing)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for entity_config in NAMED_ENTITY_LIBRARY:
+        for alias in entity_config["aliases"]:
+            if alias:
+                automaton.add_word(alias.lower(), (entity_config["entity"], alias.lower()))
+    automaton.make_automaton()
+    return automaton
+
+
+_ALIAS_AUTOMATON = _build_alias_automaton()
+
+# Fallback without pyahocorasick: aliases lowered once at import. For snippet-sized
+# text, C-level substring checks on the lowered text beat a regex alternation.
+_LOWER_LIBRARY = [
+    (entity_config["entity"], [alias.lower() for alias in entity_config["aliases"] if alias])
+    for entity_config in NAMED_ENTITY_LIBRARY
+]
+
+
 def _call_gemini(prompt: str, max_output_tokens: int = 2048, temperature: float = 0.4) -> str:
     """Unified LLM call - tries Ollama first, falls back to Gemini"""
+    return _call_llm(prompt, max_output_tokens, temperature)[0]
+
+
+def _llm_backend() -> str:
+    """Backend and model the next LLM call is expected to use (part of LLM cache keys)"""
+    if USE_OLLAMA:
+        try:
+            if check_ollama_health():
+                return f"ollama:{OLLAMA_MODEL}"
+        except Exception:
+            pass
+    return f"gemini:{GEMINI_MODEL}"
+
+
+def _call_llm(prompt: str, max_output_tokens: int, temperature: float) -> Tuple[str, str]:
+    """LLM call used by _call_gemini; returns (text, backend and model that produced it)"""
 
     # Try Ollama first
     if USE_OLLAMA:
         try:
             if check_ollama_health():
                 print(f"[LLM] Using Ollama for topic selection")
-                return call_ollama(prompt, max_output_tokens, temperature)
+                text = call_ollama(prompt, max_output_tokens, temperature)
+                return text, f"ollama:{OLLAMA_MODEL}"
             else:
                 print("[LLM] Ollama unavailable, falling back to Gemini")
         except Exception as e:
@@ -146,7 +278,7 @@ def _call_gemini(prompt: str, max_output_tokens: int = 2048, temperature: float
             "maxOutputTokens": max_output_tokens
         }
     }
-    response = requests.post(url, json=payload, timeout=60)
+    response = _SESSION.post(url, json=payload, timeout=60)
     response.raise_for_status()
     data = response.json()
     if "error" in data:
@@ -157,7 +289,24 @@ def _call_gemini(prompt: str, max_output_tokens: int = 2048, temperature: float
     parts = candidates[0].get("content", {}).get("parts", [])
     if not parts:
         raise RuntimeError("Gemini response missing content parts")
-    return parts[0].get("text", "")
+    return parts[0].get("text", ""), f"gemini:{GEMINI_MODEL}"
+
+
+# Cleaned topic history, reused until the history file changes on disk
+_HISTORY_CACHE: Dict[str, Any] = {"mtime": None, "value": None}
+
+
+def _get_history() -> Dict:
+    """Load + clean topic history once per file version (a new add_topic_to_history invalidates it)."""
+    try:
+        mtime = HISTORY_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    if _HISTORY_CACHE["value"] is not None and _HISTORY_CACHE["mtime"] == mtime:
+        return _HISTORY_CACHE["value"]
+    history = clean_old_history(load_topic_history())
+    _HISTORY_CACHE.update(mtime=mtime, value=history)
+    return history
 
 
 def search_latest_ai_news(max_results: int = 15) -> List[Dict[str, Any]]:
@@ -173,9 +322,7 @@ def search_latest_ai_news(max_results: int = 15) -> List[Dict[str, Any]]:
                 annotated = _annotate_topics_with_entities(rss_results)
                 
                 # Filter duplicates
-                history = load_topic_history()
-                history = clean_old_history(history)
-                filtered = filter_duplicate_topics(annotated, history)
+                filtered = filter_duplicate_topics(annotated, _get_history())
                 return filtered
         except Exception as e:
             print(f"[Search] RSS fetch failed: {e}")
@@ -197,13 +344,7 @@ def search_latest_ai_news(max_results: int = 15) -> List[Dict[str, Any]]:
             "tbm": "nws"
         }
 
-        headers = {
-            "X-API-KEY": SERPER_API_KEY,
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        data = response.json()
+        data = _post_serper(url, payload)
         news_items = data.get("news", [])
 
         results = []
@@ -222,9 +363,7 @@ def search_latest_ai_news(max_results: int = 15) -> List[Dict[str, Any]]:
         print(f"Found {len(results)} latest AI news topics (US)")
 
         # Filter out duplicate topics based on history
-        history = load_topic_history()
-        history = clean_old_history(history)
-        filtered_results = filter_duplicate_topics(results, history)
+        filtered_results = filter_duplicate_topics(results, _get_history())
         print(f"After filtering duplicates: {len(filtered_results)} unique topics")
 
         return filtered_results
@@ -276,13 +415,7 @@ def search_trending_topics(
             "tbm": "nws"  # News search
         }
 
-        headers = {
-            "X-API-KEY": SERPER_API_KEY,
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        data = response.json()
+        data = _post_serper(url, payload)
         news_items = data.get("news", [])
         if not news_items and "organic" in data:
             news_items = data.get("organic", [])
@@ -306,6 +439,52 @@ def search_trending_topics(
         return _annotate_topics_with_entities(_fallback_topics(topic_category))
 
 
+def search_many(
+    topic_categories: List[str],
+    region: str = "jp",
+    max_results: int = 10
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search several categories concurrently.
+
+    Serper calls are network-bound, so running them on threads (sharing the
+    pooled session) costs roughly one round trip instead of one per category.
+    """
+    categories = list(dict.fromkeys(topic_categories))
+    if not categories:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(len(categories), 8)) as executor:
+        futures = {
+            category: executor.submit(search_trending_topics, category, region, max_results)
+            for category in categories
+        }
+        return {category: future.result() for category, future in futures.items()}
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(content: str) -> Dict[str, Any]:
+    """
+    Parse the first JSON object in an LLM response (handles ```json fences and prose).
+
+    raw_decode parses in place from the first "{" and stops at the end of that object;
+    the outermost-brace slice is only tried when that fails.
+    """
+    start = content.find("{")
+    if start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(content, start)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+
+    match = re.search(r"\{.*\}", content, re.S)
+    return json.loads(match.group(0) if match else content)
+
+
 def select_topic(
     search_results: List[Dict[str, Any]],
     target_duration_minutes: int = 10,
@@ -379,21 +558,14 @@ def select_topic(
 
 JSONのみを出力してください。"""
 
-        content = _call_gemini(prompt, max_output_tokens=2048, temperature=0.2)
-
-        # Extract JSON
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-
-        content = content.strip()
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        if start >= 0 and end > start:
-            content = content[start:end]
-
-        analysis = json.loads(content)
+        # Only parsed selections are cached, keyed by the backend/model that answered
+        analysis = _cache_get(_cache_key(prompt, _llm_backend(), 2048, 0.2), LLM_CACHE_TTL)
+        if analysis is not None:
+            print("[LLM] Using cached topic selection")
+        else:
+            content, backend = _call_llm(prompt, max_output_tokens=2048, temperature=0.2)
+            analysis = _extract_json_object(content)
+            _cache_set(_cache_key(prompt, backend, 2048, 0.2), analysis)
 
         # Add the selected topic data
         selected_idx = analysis.get("selected_index", 1) - 1
@@ -428,6 +600,7 @@ JSONのみを出力してください。"""
 
 def _fallback_topics(category: str) -> List[Dict[str, Any]]:
     """Fallback topics when search is unavailable"""
+    now_iso = datetime.now().isoformat()
     topics_by_category = {
         "economics": [
             {
@@ -435,14 +608,14 @@ def _fallback_topics(category: str) -> List[Dict[str, Any]]:
                 "snippet": "最新の経済指標から見る日本経済の現状と課題",
                 "url": "",
                 "source": "Fallback",
-                "date": datetime.now().isoformat(),
+                "date": now_iso,
             },
             {
                 "title": "円相場の動向と私たちの生活への影響",
                 "snippet": "為替レートの変動が日常生活に与える影響を解説",
                 "url": "",
                 "source": "Fallback",
-                "date": datetime.now().isoformat(),
+                "date": now_iso,
             },
         ],
         "technology": [
@@ -451,7 +624,7 @@ def _fallback_topics(category: str) -> List[Dict[str, Any]]:
                 "snippet": "生成AIの進化と社会への影響",
                 "url": "",
                 "source": "Fallback",
-                "date": datetime.now().isoformat(),
+                "date": now_iso,
             },
         ],
     }
@@ -461,48 +634,87 @@ def _fallback_topics(category: str) -> List[Dict[str, Any]]:
 
 def _annotate_topics_with_entities(topics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     annotated = []
+    # One clock read per batch so all topics are scored against the same instant
+    now_ts = time.time()
     for topic in topics:
         text_parts = [topic.get("title", ""), topic.get("snippet", "")]
         entities = _extract_entities(" ".join(text_parts))
         topic_copy = dict(topic)
         topic_copy["named_entities"] = entities
         topic_copy["entity_score"] = sum(e["priority"] for e in entities)
-        topic_copy["freshness_score"] = _calculate_freshness(topic.get("date"))
+        topic_copy["freshness_score"] = _calculate_freshness(topic.get("date"), now_ts)
         topic_copy["priority_score"] = topic_copy["entity_score"] + topic_copy["freshness_score"]
         annotated.append(topic_copy)
-    annotated.sort(key=lambda item: item.get("priority_score", 0), reverse=True)
+    # Every entry has priority_score set above; a C-level key avoids a lambda call per item
+    annotated.sort(key=itemgetter("priority_score"), reverse=True)
     return annotated
 
 
+def _find_entity_aliases(text: str) -> Dict[str, set]:
+    """Return {entity label: set of lowercased aliases found in text}."""
+    found: Dict[str, set] = {}
+    if _ALIAS_AUTOMATON is not None:
+        # Single pass over the text, reporting overlapping matches too
+        for _, (label, alias) in _ALIAS_AUTOMATON.iter(text.lower()):
+            found.setdefault(label, set()).add(alias)
+        return found
+
+    lowered = text.lower()
+    for label, aliases in _LOWER_LIBRARY:
+        hits = {alias for alias in aliases if alias in lowered}
+        if hits:
+            found[label] = hits
+    return found
+
+
 def _extract_entities(text: str) -> List[Dict[str, Any]]:
     entities = []
-    normalized_text = text or ""
+    found = _find_entity_aliases(text or "")
+    if not found:
+        return entities
     for entity_config in NAMED_ENTITY_LIBRARY:
-        for alias in entity_config["aliases"]:
-            if alias and re.search(re.escape(alias), normalized_text, re.IGNORECASE):
-                entities.append({
-                    "label": entity_config["entity"],
-                    "alias": alias,
-                    "type": entity_config["type"],
-                    "priority": entity_config["priority"],
-                })
-                break
+        matched = found.get(entity_config["entity"])
+        if not matched:
+            continue
+        # Report the first listed alias that occurs (a matched longer alias implies its prefix)
+        alias = next(
+            a for a in entity_config["aliases"]
+            if a and any(a.lower() in m for m in matched)
+        )
+        entities.append({
+            "label": entity_config["entity"],
+            "alias": alias,
+            "type": entity_config["type"],
+            "priority": entity_config["priority"],
+        })
     return entities
 
 
-def _calculate_freshness(date_str: str) -> float:
-    if not date_str:
-        return 0.0
+@lru_cache(maxsize=4096)
+def _parse_topic_timestamp(date_str: str) -> Optional[float]:
+    """Parse a topic date to a UTC epoch timestamp (None if unparseable); RSS items recur across searches."""
     try:
         parsed_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
     except ValueError:
         try:
             parsed_date = datetime.strptime(date_str, "%Y-%m-%d")
         except Exception:
-            return 0.0
+            return None
     if not parsed_date.tzinfo:
         parsed_date = parsed_date.replace(tzinfo=timezone.utc)
-    delta_hours = (datetime.now(timezone.utc) - parsed_date).total_seconds() / 3600
+    return parsed_date.timestamp()
+
+
+def _calculate_freshness(date_str: str, now_ts: Optional[float] = None) -> float:
+    if not date_str:
+        return 0.0
+    published_ts = _parse_topic_timestamp(date_str)
+    if published_ts is None:
+        return 0.0
+    if now_ts is None:
+        now_ts = time.time()
+    # Plain float arithmetic on cached timestamps (no datetime/timedelta objects per topic)
+    delta_hours = (now_ts - published_ts) / 3600
     if delta_hours <= 0:
         return 1.0
     return max(0.0, 1.0 - min(delta_hours / 168.0, 1.0))  # decay over 7 days
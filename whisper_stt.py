@@ -4,21 +4,49 @@ Provides accurate subtitle timing by analyzing actual audio - 100% FREE
 No API costs - runs locally using open source Whisper model
 """
 import os
+import re
+import html
 import json
-import warnings
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from difflib import SequenceMatcher
 
-# Suppress FP16 warning on CPU
-warnings.filterwarnings("ignore", message="FP16 is not supported on CPU")
-
 try:
     import whisper
-    WHISPER_AVAILABLE = True
+    OPENAI_WHISPER_AVAILABLE = True
 except ImportError:
-    WHISPER_AVAILABLE = False
-    print("[WARNING] OpenAI Whisper not installed. Install with: pip install openai-whisper")
+    OPENAI_WHISPER_AVAILABLE = False
+
+# faster-whisper (CTranslate2, int8 on CPU) is preferred when installed
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# Batched VAD-chunk inference (faster-whisper >= 1.1)
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
+
+USE_FASTER_WHISPER = (
+    FASTER_WHISPER_AVAILABLE
+    and os.getenv("USE_FASTER_WHISPER", "true").lower() == "true"
+)
+WHISPER_AVAILABLE = OPENAI_WHISPER_AVAILABLE or USE_FASTER_WHISPER
+if not WHISPER_AVAILABLE:
+    print("[WARNING] Whisper not installed. Install with: pip install faster-whisper (or openai-whisper)")
+
+# Optional C++ fuzzy matcher for alignment (pip install rapidfuzz); difflib otherwise
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 # Import normalizers for better matching
 try:
@@ -30,25 +58,157 @@ except ImportError:
     print("[WARNING] Normalizers not found, matching might be less accurate")
 
 
+# Defaults to CPU to avoid sm_120 compatibility issues (set WHISPER_DEVICE=cuda or auto to opt in)
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+
+
+def _resolve_device(device: str) -> str:
+    """Resolve 'auto' to cuda when a GPU is visible, else cpu."""
+    if device != "auto":
+        return device
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+# faster-whisper CTranslate2 settings: int8 on CPU (AVX2/VNNI dot products), float16 on GPU;
+# CPU threads default to every core rather than CTranslate2's fixed default of 4
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0")) or (os.cpu_count() or 4)
+
+# Speech chunks decoded together by faster-whisper's batched pipeline (0 = sequential)
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "0"))
+
+# Silences at least this long are skipped by faster-whisper's VAD pre-filter
+WHISPER_VAD_MIN_SILENCE_MS = int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", "500"))
+
+# Loaded models kept for the life of the process, keyed by (backend, model_size, device).
+# At most _MODEL_CACHE_MAX models stay resident; the oldest is dropped first.
+_MODEL_CACHE: Dict[Tuple[str, str, str], object] = {}
+_MODEL_CACHE_MAX = 3
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _faster_compute_type(device: str) -> str:
+    """CTranslate2 compute type for faster-whisper (WHISPER_COMPUTE_TYPE or a per-device default)."""
+    return WHISPER_COMPUTE_TYPE or ("int8" if device == "cpu" else "float16")
+
+
+def _get_cached_model(model_size: str, device: str, use_faster: bool = False):
+    """Load a Whisper model once per process and reuse it for later calls."""
+    key = ("faster" if use_faster else "openai", model_size, device)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            print(f"Loading Whisper model '{model_size}' on {device} (this may take a moment on first run)...")
+            if use_faster:
+                model = WhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type=_faster_compute_type(device),
+                    cpu_threads=WHISPER_CPU_THREADS,
+                )
+            else:
+                model = whisper.load_model(model_size, device=device)
+            while len(_MODEL_CACHE) >= _MODEL_CACHE_MAX:
+                _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
+            _MODEL_CACHE[key] = model
+        return model
+
+
+def clear_model_cache() -> None:
+    """Drop all cached Whisper models (e.g. to free memory between batch runs)."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+def _transcribe_faster_whisper(model, audio_path: Path, language: str) -> List[Dict]:
+    """Run faster-whisper and reshape its output into {"text","start","end"} dicts."""
+    options = dict(
+        language=language,
+        word_timestamps=True,
+        # Silero VAD drops silent stretches before the encoder; timestamps stay in
+        # original-audio coordinates
+        vad_filter=True,
+        vad_parameters=dict(min_silence_duration_ms=WHISPER_VAD_MIN_SILENCE_MS),
+    )
+    if WHISPER_BATCH_SIZE > 0 and BatchedInferencePipeline is not None:
+        # Decode several VAD speech chunks per encoder pass instead of one window at a time
+        segment_iter, _info = BatchedInferencePipeline(model=model).transcribe(
+            str(audio_path), batch_size=WHISPER_BATCH_SIZE, **options
+        )
+    else:
+        segment_iter, _info = model.transcribe(str(audio_path), **options)
+
+    words = []
+    segment_level = []
+    # Segments are a lazy generator: collect both levels in a single pass.
+    # Segment-level entries stay plain tuples; they only become dicts if used.
+    for segment in segment_iter:
+        segment_level.append((segment.text, segment.start, segment.end))
+        for word in segment.words or []:
+            words.append({
+                "text": word.word.strip(),
+                "start": word.start,
+                "end": word.end
+            })
+
+    if words:
+        return words
+
+    # If no word-level data, fall back to segment-level
+    return [
+        {"text": text.strip(), "start": start, "end": end}
+        for text, start, end in segment_level
+    ]
+
+
+# Everything except word chars, whitespace, kana and kanji
+_PUNCT_RE = re.compile(r'[^\w\s\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf]')
+
+# Single alternation over all dictionary surfaces (longest first) and the
+# lowercased surface -> pronunciation map it feeds; built on first use
+_SURFACE_MAP: Optional[Dict[str, str]] = None
+_SURFACE_RE: Optional["re.Pattern"] = None
+
+
+def _get_surface_pattern() -> Tuple["re.Pattern", Dict[str, str]]:
+    """Build the dictionary alternation pattern once per process."""
+    global _SURFACE_MAP, _SURFACE_RE
+    if _SURFACE_RE is None:
+        all_entries = voicevox_dictionary.ESSENTIAL_DICTIONARY + getattr(voicevox_dictionary, "MATCHING_ONLY_DICTIONARY", [])
+        sorted_entries = sorted(all_entries, key=lambda x: len(x.surface), reverse=True)
+        surface_map: Dict[str, str] = {}
+        for entry in sorted_entries:
+            # First (longest) entry wins, as with the old sequential passes
+            surface_map.setdefault(entry.surface.lower(), entry.pronunciation)
+        surfaces = sorted(surface_map, key=len, reverse=True)
+        _SURFACE_RE = re.compile("|".join(re.escape(s) for s in surfaces), re.IGNORECASE)
+        _SURFACE_MAP = surface_map
+    return _SURFACE_RE, _SURFACE_MAP
+
+
+@lru_cache(maxsize=8192)
 def normalize_for_matching(text: str) -> str:
     """
     Normalize text for comparison (convert English/Numbers to Japanese reading).
     Removes all punctuation and symbols for maximum matching robustness.
+    Results are memoized; call normalize_for_matching.cache_clear() after
+    changing the dictionaries at runtime.
     """
     if not text:
         return ""
     
-    # 1. Decode HTML just in case
-    import html
-    normalized = html.unescape(text)
+    # 1. Decode HTML just in case (entities always start with "&")
+    normalized = html.unescape(text) if "&" in text else text
     
     # 2. Basic normalization (lowercase, remove whitespace)
     normalized = normalized.strip().lower().replace(" ", "").replace("　", "")
     
     # 3. Remove punctuation and symbols
-    import re
     # Remove things like 、。！？?.,![]()""''...
-    normalized = re.sub(r'[^\w\s\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf]', '', normalized)
+    normalized = _PUNCT_RE.sub('', normalized)
     
     if not NORMALIZERS_AVAILABLE:
         return normalized
@@ -57,19 +217,14 @@ def normalize_for_matching(text: str) -> str:
     try:
         normalized = text_normalizer.normalize_for_tts(normalized)
         # Re-remove any punctuation added by normalizer (like dots in versions)
-        normalized = re.sub(r'[^\w\s\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf]', '', normalized)
+        normalized = _PUNCT_RE.sub('', normalized)
     except Exception:
         pass
 
     # 5. Convert English terms using dictionary
     try:
-        all_entries = voicevox_dictionary.ESSENTIAL_DICTIONARY + getattr(voicevox_dictionary, "MATCHING_ONLY_DICTIONARY", [])
-        sorted_entries = sorted(all_entries, key=lambda x: len(x.surface), reverse=True)
-        
-        for entry in sorted_entries:
-            # Case-insensitive replacement
-            pattern = re.compile(re.escape(entry.surface), re.IGNORECASE)
-            normalized = pattern.sub(entry.pronunciation, normalized)
+        surface_re, surface_map = _get_surface_pattern()
+        normalized = surface_re.sub(lambda m: surface_map[m.group(0).lower()], normalized)
     except Exception:
         pass
         
@@ -79,7 +234,8 @@ def normalize_for_matching(text: str) -> str:
 def transcribe_audio_with_whisper(
     audio_path: Path,
     model_size: str = "base",
-    language: str = "ja"
+    language: str = "ja",
+    device: str = WHISPER_DEVICE
 ) -> Optional[List[Dict]]:
     """
     Transcribe audio using local Whisper model (100% FREE).
@@ -93,6 +249,7 @@ def transcribe_audio_with_whisper(
                    - medium: high accuracy (~5GB RAM)
                    - large: best accuracy (~10GB RAM)
         language: Language code (ja for Japanese)
+        device: Torch device for inference (loaded models are cached per device)
 
     Returns:
         List of word-level segments with accurate timing
@@ -106,18 +263,26 @@ def transcribe_audio_with_whisper(
         return None
 
     try:
-        print(f"Loading Whisper model '{model_size}' (this may take a moment on first run)...")
-        # Force CPU to avoid sm_120 compatibility issues
-        model = whisper.load_model(model_size, device="cpu")
+        device = _resolve_device(device)
+        model = _get_cached_model(model_size, device, use_faster=USE_FASTER_WHISPER)
+
+        if USE_FASTER_WHISPER:
+            print(f"Transcribing audio with faster-whisper on {device} ({_faster_compute_type(device)}, 100% FREE, no API costs)...")
+            segments = _transcribe_faster_whisper(model, audio_path, language)
+            print(f"✅ Transcribed {len(segments)} segments with faster-whisper")
+            return segments
 
-        print(f"Transcribing audio with Whisper (100% FREE, no API costs)...")
+        # FP16 halves memory traffic on GPU; CPU has no FP16 kernels, so stay FP32 there
+        use_fp16 = device.startswith("cuda")
+        print(f"Transcribing audio with Whisper on {device} ({'fp16' if use_fp16 else 'fp32'}, 100% FREE, no API costs)...")
 
         # Transcribe with word-level timestamps
         result = model.transcribe(
             str(audio_path),
             language=language,
             word_timestamps=True,
-            verbose=False
+            verbose=False,
+            fp16=use_fp16
         )
 
         # Extract word-level segments
@@ -149,6 +314,57 @@ def transcribe_audio_with_whisper(
         return None
 
 
+# Minimum similarity for the pointer fast path to skip the windowed scan
+FAST_PATH_SIMILARITY = 0.8
+# Lines shorter than this (はい, そうですね: about a second of speech at the ~7 chars/s
+# used for fallback timing) recur verbatim all over a dialogue. They skip the
+# verbatim jump, which takes the first exact repeat even when a nearer misheard
+# copy would match; the sweep and scan below take the nearest good window instead.
+SHORT_LINE_CHARS = 8
+
+
+def _make_scorer(script_text: str):
+    """
+    Return score(window_text, score_cutoff=0.0) -> similarity (0-1) against
+    one normalized script line. With rapidfuzz, scores below score_cutoff are
+    abandoned early and reported as 0. The difflib fallback keeps the script
+    as the matcher's second sequence so its index is built once per dialogue
+    rather than once per window.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        def score(window_text: str, score_cutoff: float = 0.0) -> float:
+            return fuzz.ratio(script_text, window_text, score_cutoff=score_cutoff * 100) / 100.0
+        return score
+
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(script_text)
+
+    def score(window_text: str, score_cutoff: float = 0.0) -> float:
+        matcher.set_seq1(window_text)
+        similarity = matcher.quick_ratio()
+        if similarity > 0.6:
+            # High enough to be a candidate, do full ratio
+            similarity = matcher.ratio()
+        return similarity
+    return score
+
+
+def _best_fit_window(score, normalized_concat: str, offsets: List[int], j: int, script_len: int) -> Tuple[float, int]:
+    """
+    Score the window starting at segment j whose length matches the script,
+    plus one segment shorter/longer. Returns (similarity, end segment index);
+    similarities at or below FAST_PATH_SIMILARITY may be reported as 0.
+    """
+    num_segments = len(offsets) - 1
+    fit_k = bisect_left(offsets, offsets[j] + script_len, j + 1) - 1
+    best_similarity, best_k = 0.0, j
+    for k in range(max(j, fit_k - 1), min(fit_k + 2, num_segments)):
+        similarity = score(normalized_concat[offsets[j]:offsets[k + 1]], score_cutoff=FAST_PATH_SIMILARITY)
+        if similarity > best_similarity:
+            best_similarity, best_k = similarity, k
+    return best_similarity, best_k
+
+
 def align_script_with_whisper_transcription(
     script_dialogues: List[Dict],
     whisper_segments: List[Dict]
@@ -166,24 +382,23 @@ def align_script_with_whisper_transcription(
     if not whisper_segments:
         return None
 
-    # Combine all transcribed text for analysis
-    full_transcription = "".join([s["text"] for s in whisper_segments])
-
     aligned_data = []
     current_segment_idx = 0
 
     print(f"  Aligning {len(script_dialogues)} dialogues with Whisper transcription...")
 
-    # Pre-normalize transcription for faster matching
-    # We keep original indices to map back to timestamps
-    normalized_segments = []
-    for s in whisper_segments:
-        normalized_segments.append({
-            "text": normalize_for_matching(s["text"]),
-            "original_text": s["text"],
-            "start": s["start"],
-            "end": s["end"]
-        })
+    # Pre-normalize transcription once, into flat lists (same indices as whisper_segments)
+    normalized_texts = [normalize_for_matching(s["text"]) for s in whisper_segments]
+    seg_starts = [s["start"] for s in whisper_segments]
+    seg_ends = [s["end"] for s in whisper_segments]
+    num_segments = len(whisper_segments)
+
+    # Concatenated normalized text + offsets: window j..k is a single slice
+    # instead of being rebuilt by repeated string concatenation
+    normalized_concat = "".join(normalized_texts)
+    offsets = [0]
+    for text in normalized_texts:
+        offsets.append(offsets[-1] + len(text))
 
     for i, dialogue in enumerate(script_dialogues):
         # Normalize script text
@@ -192,6 +407,8 @@ def align_script_with_whisper_transcription(
         if not script_text_norm:
             # Skip empty dialogues
             continue
+        script_len = len(script_text_norm)
+        score = _make_scorer(script_text_norm)
 
         # Find best match in transcription
         best_match_start = None
@@ -199,30 +416,76 @@ def align_script_with_whisper_transcription(
         best_similarity = 0
         best_idx = current_segment_idx
 
+        # Fast path: dialogues are spoken in order, so the next one usually starts
+        # right at the pointer. Score only the window whose length matches the
+        # script (plus its neighbours) and skip the full scan if it fits well.
+        if current_segment_idx < num_segments:
+            best_similarity, best_idx = _best_fit_window(
+                score, normalized_concat, offsets, current_segment_idx, script_len
+            )
+            best_match_start = seg_starts[current_segment_idx]
+            best_match_end = seg_ends[best_idx]
+
         # Search through segments to find this dialogue
         # Look ahead up to 300 segments (to find long dialogues)
-        max_lookahead = min(current_segment_idx + 300, len(normalized_segments))
+        max_lookahead = min(current_segment_idx + 300, num_segments)
+
+        if (best_similarity <= FAST_PATH_SIMILARITY and current_segment_idx < num_segments
+                and script_len >= SHORT_LINE_CHARS):
+            # Verbatim occurrence further ahead: map it to segment boundaries directly
+            pos = normalized_concat.find(script_text_norm, offsets[current_segment_idx], offsets[max_lookahead])
+            if pos >= 0:
+                j = bisect_right(offsets, pos) - 1
+                k = bisect_right(offsets, pos + script_len - 1) - 1
+                best_similarity = 1.0
+                best_match_start = seg_starts[j]
+                best_match_end = seg_ends[k]
+                best_idx = k
+
+        if best_similarity <= FAST_PATH_SIMILARITY and RAPIDFUZZ_AVAILABLE:
+            # Something was inserted before this dialogue: score the length-matched
+            # window at every later start in one rapidfuzz call and take the
+            # earliest that clears the bar
+            starts = range(current_segment_idx + 1, max_lookahead)
+            # Generator: extract_iter pulls windows lazily, so slicing stops at the first hit
+            choices = (
+                normalized_concat[offsets[j]:offsets[min(bisect_left(offsets, offsets[j] + script_len, j + 1), num_segments)]]
+                for j in starts
+            )
+            hit = next(process.extract_iter(
+                script_text_norm, choices, scorer=fuzz.ratio,
+                score_cutoff=FAST_PATH_SIMILARITY * 100,
+            ), None)
+            if hit is not None:
+                j = starts[hit[2]]
+                best_similarity, best_idx = _best_fit_window(
+                    score, normalized_concat, offsets, j, script_len
+                )
+                best_match_start = seg_starts[j]
+                best_match_end = seg_ends[best_idx]
+
+        if best_similarity > FAST_PATH_SIMILARITY:
+            max_lookahead = current_segment_idx
         
         for j in range(current_segment_idx, max_lookahead):
-            window_text = ""
-            window_start = normalized_segments[j]["start"]
+            window_start = seg_starts[j]
+            window_begin = offsets[j]
+            # Growing the window past the best fit only lowers similarity: stop once
+            # it has dropped for several consecutive steps
+            prev_similarity = 0.0
+            decreases = 0
+            
+            # Windows longer than the script by more than 50 chars are never scored:
+            # binary-search the last segment that keeps the window within that length
+            window_limit = bisect_right(offsets, window_begin + script_len + 50, j + 1) - 1
             
             # Build window
-            for k in range(j, min(j + 100, len(normalized_segments))):
-                window_text += normalized_segments[k]["text"]
-                window_end = normalized_segments[k]["end"]
+            for k in range(j, min(j + 100, num_segments, window_limit)):
+                window_text = normalized_concat[window_begin:offsets[k + 1]]
+                window_end = seg_ends[k]
 
                 # Calculate similarity
-                # We use a faster similarity check first
-                if abs(len(window_text) - len(script_text_norm)) > 50 and len(window_text) > len(script_text_norm) + 20:
-                    # Window getting too long, stop this inner loop
-                    break
-                
-                similarity = SequenceMatcher(None, script_text_norm, window_text).quick_ratio()
-                
-                if similarity > 0.6:
-                    # High enough to be a candidate, do full ratio
-                    similarity = SequenceMatcher(None, script_text_norm, window_text).ratio()
+                similarity = score(window_text)
 
                 if similarity > best_similarity:
                     best_similarity = similarity
@@ -233,6 +496,14 @@ def align_script_with_whisper_transcription(
                     if similarity > 0.9:
                         break
 
+                if similarity + 1e-3 < prev_similarity:
+                    decreases += 1
+                    if decreases >= 3:
+                        break
+                else:
+                    decreases = 0
+                prev_similarity = similarity
+
             if best_similarity > 0.8:
                 break
 
@@ -282,6 +553,12 @@ def align_script_with_whisper_transcription(
     return aligned_data
 
 
+def _prewarm_normalization(texts: List[str]) -> None:
+    """Fill the normalize_for_matching cache for texts that will be aligned later."""
+    for text in texts:
+        normalize_for_matching(text)
+
+
 def generate_accurate_subtitles_with_whisper(
     script_dialogues: List[Dict],
     audio_path: Path,
@@ -299,6 +576,15 @@ def generate_accurate_subtitles_with_whisper(
     Returns:
         Accurate timing data for subtitles, or None if transcription fails
     """
+    # Normalize the script on a background thread while Whisper runs (model
+    # inference releases the GIL); alignment then hits the normalize_for_matching cache
+    prewarm = threading.Thread(
+        target=_prewarm_normalization,
+        args=([d["text"] for d in script_dialogues],),
+        daemon=True,
+    )
+    prewarm.start()
+
     # Step 1: Transcribe audio with Whisper (local, free)
     transcription = transcribe_audio_with_whisper(
         audio_path,
@@ -310,6 +596,8 @@ def generate_accurate_subtitles_with_whisper(
         print("⚠️  Whisper transcription failed, falling back to estimated timing")
         return None
 
+    prewarm.join()
+
     # Step 2: Align script with transcription for perfect timing
     aligned_timing = align_script_with_whisper_transcription(
         script_dialogues,
@@ -319,6 +607,45 @@ def generate_accurate_subtitles_with_whisper(
     return aligned_timing
 
 
+def generate_accurate_subtitles_batch(
+    jobs: List[Tuple[List[Dict], Path]],
+    model_size: str = "base"
+) -> List[Optional[List[Dict]]]:
+    """
+    Generate subtitles for several (script_dialogues, audio_path) jobs with one resident model.
+
+    Transcription runs sequentially (one model, one device), while alignment of
+    file K runs on a worker thread and overlaps transcription of file K+1.
+
+    Returns:
+        Timing data per job in input order (None where transcription failed)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    results: List[Optional[List[Dict]]] = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=1) as align_executor:
+        futures = []
+        for idx, (script_dialogues, audio_path) in enumerate(jobs):
+            transcription = transcribe_audio_with_whisper(
+                audio_path,
+                model_size=model_size,
+                language="ja"
+            )
+            if not transcription:
+                print(f"⚠️  Whisper transcription failed for {audio_path}, falling back to estimated timing")
+                continue
+            futures.append((idx, align_executor.submit(
+                align_script_with_whisper_transcription,
+                script_dialogues,
+                transcription
+            )))
+
+        for idx, future in futures:
+            results[idx] = future.result()
+
+    return results
+
+
 # Export main function
 generate_accurate_subtitles = generate_accurate_subtitles_with_whisper
 
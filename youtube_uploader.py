@@ -5,13 +5,18 @@ Handles authentication, video upload, thumbnail setting, and comment posting
 import os
 import json
 import pickle
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from collections import OrderedDict
 from typing import Optional, Dict, List
+import google_auth_httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, build_http
 from googleapiclient.errors import HttpError
 
 # YouTube API scopes
@@ -22,7 +27,77 @@ SCOPES = [
 
 BASE = Path(__file__).parent
 CREDENTIALS_FILE = BASE / "youtube_credentials.json"
-TOKEN_FILE = BASE / "youtube_auth.pickle"  # Changed from youtube_token.pickle to avoid directory conflict
+TOKEN_FILE = BASE / "youtube_auth.json"
+# Token location used by older versions (pickle or JSON); read once and migrated to TOKEN_FILE
+LEGACY_TOKEN_FILE = BASE / "youtube_auth.pickle"  # Changed from youtube_token.pickle to avoid directory conflict
+
+# Concurrent commentThreads.insert calls in post_comments; above 1, comments may
+# appear on the video out of order
+COMMENT_WORKERS = int(os.getenv("YOUTUBE_COMMENT_WORKERS", "1"))
+# Retries per idempotent API request and upload chunk; googleapiclient backs off
+# exponentially with random jitter (rand() * 2**attempt s) on 5xx, 429, rate-limit
+# 403s and socket errors. Inserts (comments, playlist items) are never retried.
+API_NUM_RETRIES = int(os.getenv("YOUTUBE_API_RETRIES", "5"))
+
+# Refresh OAuth tokens this long before expiry, so a long upload never starts on a dying token
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# (video_id, comment text) pairs already posted by this process, oldest evicted first
+_POSTED_COMMENTS: "OrderedDict[tuple, None]" = OrderedDict()
+_POSTED_COMMENTS_MAX = 10000
+_POSTED_COMMENTS_LOCK = threading.Lock()
+
+# httplib2.Http is not thread-safe: worker threads each get their own
+_thread_local = threading.local()
+
+# Snippets sent for videos uploaded/updated by this process, so updates can skip the videos.list GET
+_SNIPPET_CACHE: Dict[str, Dict] = {}
+
+# Authentication method resolved on first use (see _resolve_auth_mode)
+_AUTH_MODE: Optional[str] = None
+_SA_PATH: Optional[str] = None
+
+# Authenticated service shared by every upload in this process (see get_youtube_service)
+_YT_SERVICE = None
+_YT_LOCK = threading.Lock()
+
+
+def _load_token(path: Path) -> Optional[Credentials]:
+    """
+    Load saved OAuth credentials.
+
+    Tokens are stored as authorized-user JSON; files written by older versions
+    are pickles (first byte 0x80) and are still accepted.
+    """
+    data = path.read_bytes()
+    if data[:1] == b"\x80":
+        return pickle.loads(data)
+    return Credentials.from_authorized_user_info(json.loads(data), SCOPES)
+
+
+def _save_token(path: Path, creds: Credentials) -> None:
+    """Save OAuth credentials as authorized-user JSON."""
+    path.write_text(creds.to_json(), encoding="utf-8")
+
+
+def _resolve_auth_mode():
+    """
+    Decide once per process between service account and OAuth authentication.
+
+    Returns:
+        ("service_account", key file path) or ("oauth", None)
+    """
+    global _AUTH_MODE, _SA_PATH
+    if _AUTH_MODE is None:
+        service_account_path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+        service_account_file = BASE / "youtube_service_account.json"
+        if service_account_path:
+            _AUTH_MODE, _SA_PATH = "service_account", service_account_path
+        elif service_account_file.exists():
+            _AUTH_MODE, _SA_PATH = "service_account", str(service_account_file)
+        else:
+            _AUTH_MODE, _SA_PATH = "oauth", None
+    return _AUTH_MODE, _SA_PATH
 
 
 def authenticate_youtube() -> Optional[any]:
@@ -32,21 +107,16 @@ def authenticate_youtube() -> Optional[any]:
     Returns:
         YouTube API service object or None if authentication fails
     """
+    global _AUTH_MODE
+
     # Check for service account first
-    service_account_path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-    service_account_file = BASE / "youtube_service_account.json"
+    auth_mode, sa_path = _resolve_auth_mode()
 
-    if service_account_path or service_account_file.exists():
+    if auth_mode == "service_account":
         # Use service account authentication
         try:
             from google.oauth2 import service_account
 
-            # Determine service account file path
-            if service_account_path:
-                sa_path = service_account_path
-            else:
-                sa_path = str(service_account_file)
-
             print(f"Using service account authentication: {sa_path}")
 
             credentials = service_account.Credentials.from_service_account_file(
@@ -54,20 +124,24 @@ def authenticate_youtube() -> Optional[any]:
                 scopes=SCOPES
             )
 
-            return build('youtube', 'v3', credentials=credentials)
+            return build('youtube', 'v3', credentials=credentials, static_discovery=True, cache_discovery=False)
 
         except Exception as e:
             print(f"Service account authentication failed: {e}")
             print("Falling back to OAuth 2.0...")
+            # Don't retry a broken service account on later authentications
+            _AUTH_MODE = "oauth"
 
     # Fallback to OAuth 2.0
     creds = None
 
     # Load existing token if available
-    if TOKEN_FILE.exists():
+    token_path = TOKEN_FILE if TOKEN_FILE.exists() else LEGACY_TOKEN_FILE
+    if token_path.exists():
         try:
-            with open(TOKEN_FILE, 'rb') as token:
-                creds = pickle.load(token)
+            creds = _load_token(token_path)
+            if token_path == LEGACY_TOKEN_FILE and creds:
+                _save_token(TOKEN_FILE, creds)
         except Exception as e:
             print(f"Error loading token: {e}")
 
@@ -135,13 +209,13 @@ def authenticate_youtube() -> Optional[any]:
 
         # Save the credentials for next run
         try:
-            with open(TOKEN_FILE, 'wb') as token:
-                pickle.dump(creds, token)
+            _save_token(TOKEN_FILE, creds)
         except Exception as e:
             print(f"Error saving token: {e}")
 
     try:
-        youtube = build('youtube', 'v3', credentials=creds)
+        # Bundled discovery document: no HTTPS fetch per build, and no discovery-cache probe
+        youtube = build('youtube', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
         print("✅ YouTube API authentication successful")
         return youtube
     except Exception as e:
@@ -149,6 +223,174 @@ def authenticate_youtube() -> Optional[any]:
         return None
 
 
+def get_youtube_service(force_refresh: bool = False) -> Optional[any]:
+    """
+    Return a cached authenticated YouTube service, authenticating on first use.
+
+    Expired credentials are refreshed in place; if that fails (or force_refresh
+    is set) the service is rebuilt via authenticate_youtube().
+    """
+    global _YT_SERVICE
+    with _YT_LOCK:
+        if _YT_SERVICE is not None and not force_refresh:
+            creds = _service_credentials(_YT_SERVICE)
+            if creds is None or not getattr(creds, "expired", False):
+                return _YT_SERVICE
+            try:
+                creds.refresh(Request())
+                return _YT_SERVICE
+            except Exception as e:
+                print(f"Error refreshing cached credentials: {e}")
+
+        _YT_SERVICE = authenticate_youtube()
+        return _YT_SERVICE
+
+
+def _refresh_if_expiring(credentials) -> None:
+    """Refresh credentials that expire within TOKEN_REFRESH_MARGIN."""
+    expiry = getattr(credentials, "expiry", None)
+    if expiry is None or not getattr(credentials, "refresh_token", None):
+        return
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if expiry - now < TOKEN_REFRESH_MARGIN:
+        try:
+            credentials.refresh(Request())
+        except Exception as e:
+            print(f"Error refreshing credentials before upload: {e}")
+
+
+def _service_credentials(youtube):
+    """Credentials behind a discovery service object (None if unavailable)."""
+    return getattr(getattr(youtube, "_http", None), "credentials", None)
+
+
+def _execute(request, credentials=None, idempotent=True):
+    """Execute an API request, on a thread-local transport when credentials are given.
+
+    Non-idempotent requests (inserts) are sent once: a retry after a lost response
+    would create the resource twice.
+    """
+    num_retries = API_NUM_RETRIES if idempotent else 0
+    if credentials is not None:
+        return request.execute(http=_thread_http(credentials), num_retries=num_retries)
+    return request.execute(num_retries=num_retries)
+
+
+# ISO-BMFF major brands of still images; MP4/MOV share the ftyp box but are not thumbnails
+_IMAGE_FTYP_BRANDS = {
+    b'avif': 'image/avif',
+    b'avis': 'image/avif',
+    b'heic': 'image/heic',
+    b'heix': 'image/heic',
+}
+
+
+def _sniff_image_mime(path: str, default: str) -> str:
+    """Detect a PNG/JPEG/AVIF/HEIC image from the file's magic bytes (default if unknown)."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(12)
+    except OSError:
+        return default
+    if head.startswith(b'\x89PNG'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head[4:8] == b'ftyp':
+        return _IMAGE_FTYP_BRANDS.get(head[8:12], default)
+    return default
+
+
+def _set_thumbnail(youtube, video_id: str, thumbnail_path: str, credentials=None) -> None:
+    """Upload a custom thumbnail (failures are reported, not raised)."""
+    try:
+        print(f"\n🖼️  Uploading custom thumbnail...")
+        # Generated thumbnails may be PNG despite a .jpg name: declare what is really there
+        thumbnail_media = MediaFileUpload(
+            thumbnail_path,
+            mimetype=_sniff_image_mime(thumbnail_path, 'image/jpeg')
+        )
+        _execute(youtube.thumbnails().set(
+            videoId=video_id,
+            media_body=thumbnail_media
+        ), credentials)
+        print(f"✅ Thumbnail uploaded successfully!")
+    except HttpError as e:
+        print(f"⚠️  Failed to upload thumbnail: {e}")
+
+
+def _add_to_playlist(youtube, video_id: str, playlist_id: str, credentials=None) -> None:
+    """Add a video to a playlist (failures are reported, not raised)."""
+    try:
+        print(f"\n📋 Adding video to playlist...")
+        _execute(youtube.playlistItems().insert(
+            part='snippet',
+            fields='id',
+            body={
+                'snippet': {
+                    'playlistId': playlist_id,
+                    'resourceId': {
+                        'kind': 'youtube#video',
+                        'videoId': video_id
+                    }
+                }
+            }
+        ), credentials, idempotent=False)
+        print(f"✅ Video added to playlist successfully!")
+    except HttpError as e:
+        print(f"⚠️  Failed to add to playlist: {e}")
+
+
+def _post_comments_task(youtube, video_id: str, comments: List[str], credentials=None) -> None:
+    """post_comments with the post-upload task signature (it manages its own threads)."""
+    post_comments(youtube, video_id, comments, credentials=credentials)
+
+
+def _run_task(func, youtube, video_id: str, arg, credentials) -> None:
+    """Run one post-upload task; an unexpected error must not fail the upload."""
+    try:
+        func(youtube, video_id, arg, credentials)
+    except Exception as e:
+        print(f"⚠️  {func.__name__} failed: {e}")
+
+
+def _run_post_upload_tasks(
+    youtube,
+    video_id: str,
+    thumbnail_path: Optional[str] = None,
+    playlist_id: Optional[str] = None,
+    comments: Optional[List[str]] = None
+) -> None:
+    """
+    Set thumbnail, add to playlist and post comments for an uploaded video.
+
+    The calls are independent once the video ID is known, so they run
+    concurrently (each thread on its own HTTP transport) and are all finished
+    when this returns.
+    """
+    tasks = []
+    if thumbnail_path and os.path.isfile(thumbnail_path):
+        tasks.append((_set_thumbnail, thumbnail_path))
+    if playlist_id:
+        tasks.append((_add_to_playlist, playlist_id))
+    if comments:
+        tasks.append((_post_comments_task, comments))
+    if not tasks:
+        return
+
+    credentials = _service_credentials(youtube)
+    if len(tasks) == 1 or credentials is None:
+        for func, arg in tasks:
+            _run_task(func, youtube, video_id, arg, credentials)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(_run_task, func, youtube, video_id, arg, credentials) for func, arg in tasks]
+        for future in futures:
+            future.result()
+
+
 def upload_video(
     youtube,
     video_path: str,
@@ -181,9 +423,15 @@ def upload_video(
         print("YouTube API not authenticated")
         return None
 
-    if not Path(video_path).exists():
+    # One stat both checks the file and catches empty outputs before any API call
+    try:
+        video_size = os.stat(video_path).st_size
+    except OSError:
         print(f"Video file not found: {video_path}")
         return None
+    if video_size == 0:
+        print(f"Video file is empty: {video_path}")
+        return None
 
     # Prepare video metadata
     body = {
@@ -204,7 +452,8 @@ def upload_video(
         print(f"   Title: {title}")
         print(f"   Privacy: {privacy_status}")
 
-        # Create media upload
+        # Create media upload: chunksize=-1 streams the whole file in one PUT of a
+        # resumable session, so a failed transfer can resume instead of restarting
         media = MediaFileUpload(
             video_path,
             chunksize=-1,  # Upload in a single request
@@ -213,61 +462,42 @@ def upload_video(
         )
 
         # Execute upload
+        # fields='id': only the new ID is needed back, not the full resource
         request = youtube.videos().insert(
             part='snippet,status',
+            fields='id',
             body=body,
             media_body=media
         )
 
+        # Own transport per thread, so concurrent uploads never share an httplib2.Http
+        credentials = _service_credentials(youtube)
+        http = _thread_http(credentials) if credentials is not None else None
+        if credentials is not None:
+            _refresh_if_expiring(credentials)
+
         response = None
+        last_reported = -5  # Only report progress in steps of at least 5%
         while response is None:
-            status, response = request.next_chunk()
+            # On 5xx/429/connection errors next_chunk backs off and re-sends within
+            # the same resumable session instead of failing the whole upload
+            status, response = request.next_chunk(http=http, num_retries=API_NUM_RETRIES)
             if status:
                 progress = int(status.progress() * 100)
-                print(f"   Upload progress: {progress}%")
+                if progress - last_reported >= 5:
+                    print(f"   Upload progress: {progress}%")
+                    last_reported = progress
 
         video_id = response['id']
+        _SNIPPET_CACHE[video_id] = dict(body['snippet'])
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
         print(f"✅ Video uploaded successfully!")
         print(f"   Video ID: {video_id}")
         print(f"   URL: {video_url}")
 
-        # Upload thumbnail if provided
-        if thumbnail_path and Path(thumbnail_path).exists():
-            try:
-                print(f"\n🖼️  Uploading custom thumbnail...")
-                thumbnail_media = MediaFileUpload(
-                    thumbnail_path,
-                    mimetype='image/jpeg'
-                )
-                youtube.thumbnails().set(
-                    videoId=video_id,
-                    media_body=thumbnail_media
-                ).execute()
-                print(f"✅ Thumbnail uploaded successfully!")
-            except HttpError as e:
-                print(f"⚠️  Failed to upload thumbnail: {e}")
-
-        # Add to playlist if specified
-        if playlist_id:
-            try:
-                print(f"\n📋 Adding video to playlist...")
-                youtube.playlistItems().insert(
-                    part='snippet',
-                    body={
-                        'snippet': {
-                            'playlistId': playlist_id,
-                            'resourceId': {
-                                'kind': 'youtube#video',
-                                'videoId': video_id
-                            }
-                        }
-                    }
-                ).execute()
-                print(f"✅ Video added to playlist successfully!")
-            except HttpError as e:
-                print(f"⚠️  Failed to add to playlist: {e}")
+        # Thumbnail and playlist only need the video ID: run them side by side
+        _run_post_upload_tasks(youtube, video_id, thumbnail_path, playlist_id)
 
         return {
             'video_id': video_id,
@@ -284,18 +514,53 @@ def upload_video(
         return None
 
 
+def _thread_http(credentials):
+    """Authorized HTTP transport owned by the calling thread."""
+    http = getattr(_thread_local, "http", None)
+    if http is None or http.credentials is not credentials:
+        # build_http() applies googleapiclient's default socket timeout
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+        _thread_local.http = http
+    return http
+
+
+def _post_one_comment(youtube, video_id: str, comment_text: str, credentials=None) -> None:
+    """Insert a single top-level comment (raises on failure)."""
+    request = youtube.commentThreads().insert(
+        part='snippet',
+        fields='id',
+        body={
+            'snippet': {
+                'videoId': video_id,
+                'topLevelComment': {
+                    'snippet': {
+                        'textOriginal': comment_text
+                    }
+                }
+            }
+        }
+    )
+    _execute(request, credentials, idempotent=False)
+
+
 def post_comments(
     youtube,
     video_id: str,
-    comments: List[str]
+    comments: List[str],
+    credentials=None
 ) -> int:
     """
     Post comments to a video
 
+    Comments are posted one at a time, in order. Setting YOUTUBE_COMMENT_WORKERS
+    above 1 posts them concurrently (each thread with its own HTTP connection),
+    at the cost of the order they appear in.
+
     Args:
         youtube: YouTube API service object
         video_id: YouTube video ID
         comments: List of comment texts to post
+        credentials: Credentials for per-thread transports (default: the service's)
 
     Returns:
         Number of successfully posted comments
@@ -306,29 +571,42 @@ def post_comments(
 
     posted_count = 0
 
+    # YouTube rejects exact duplicates after a full round trip: drop repeats within
+    # this call and comments this process already posted to the same video
+    unique = list(dict.fromkeys(comments))
+    with _POSTED_COMMENTS_LOCK:
+        unique = [c for c in unique if (video_id, c) not in _POSTED_COMMENTS]
+    if len(unique) < len(comments):
+        print(f"\n💬 Skipping {len(comments) - len(unique)} duplicate comments")
+    comments = unique
+    if not comments:
+        return 0
+
     print(f"\n💬 Posting {len(comments)} comments...")
 
-    for i, comment_text in enumerate(comments, 1):
-        try:
-            youtube.commentThreads().insert(
-                part='snippet',
-                body={
-                    'snippet': {
-                        'videoId': video_id,
-                        'topLevelComment': {
-                            'snippet': {
-                                'textOriginal': comment_text
-                            }
-                        }
-                    }
-                }
-            ).execute()
-            print(f"   Comment {i}/{len(comments)} posted")
-            posted_count += 1
-        except HttpError as e:
-            print(f"   ⚠️  Failed to post comment {i}: {e}")
-        except Exception as e:
-            print(f"   ⚠️  Error posting comment {i}: {e}")
+    # Per-thread transports need the service's credentials; post serially without them
+    if credentials is None:
+        credentials = _service_credentials(youtube)
+    workers = min(COMMENT_WORKERS, len(comments)) if credentials is not None else 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(_post_one_comment, youtube, video_id, comment_text, credentials)
+            for comment_text in comments
+        ]
+        for i, future in enumerate(futures, 1):
+            try:
+                future.result()
+                print(f"   Comment {i}/{len(comments)} posted")
+                posted_count += 1
+                with _POSTED_COMMENTS_LOCK:
+                    _POSTED_COMMENTS[(video_id, comments[i - 1])] = None
+                    if len(_POSTED_COMMENTS) > _POSTED_COMMENTS_MAX:
+                        _POSTED_COMMENTS.popitem(last=False)
+            except HttpError as e:
+                print(f"   ⚠️  Failed to post comment {i}: {e}")
+            except Exception as e:
+                print(f"   ⚠️  Error posting comment {i}: {e}")
 
     print(f"✅ Posted {posted_count}/{len(comments)} comments successfully")
     return posted_count
@@ -360,18 +638,26 @@ def update_video_metadata(
         print("YouTube API not authenticated")
         return False
 
+    # Requests go through the calling thread's own transport (see _execute)
+    credentials = _service_credentials(youtube)
+
     try:
-        # Get current video data
-        video = youtube.videos().list(
-            part='snippet',
-            id=video_id
-        ).execute()
+        snippet = _SNIPPET_CACHE.get(video_id)
+        if snippet is not None:
+            # Uploaded/updated by this process: merge into the known snippet
+            snippet = dict(snippet)
+        else:
+            # Get current video data
+            video = _execute(youtube.videos().list(
+                part='snippet',
+                id=video_id
+            ), credentials)
 
-        if not video.get('items'):
-            print(f"Video not found: {video_id}")
-            return False
+            if not video.get('items'):
+                print(f"Video not found: {video_id}")
+                return False
 
-        snippet = video['items'][0]['snippet']
+            snippet = video['items'][0]['snippet']
 
         # Update only provided fields
         if title:
@@ -384,13 +670,15 @@ def update_video_metadata(
             snippet['categoryId'] = category_id
 
         # Update video
-        youtube.videos().update(
+        _execute(youtube.videos().update(
             part='snippet',
+            fields='id',
             body={
                 'id': video_id,
                 'snippet': snippet
             }
-        ).execute()
+        ), credentials)
+        _SNIPPET_CACHE[video_id] = snippet
 
         print(f"✅ Video metadata updated successfully")
         return True
@@ -425,8 +713,8 @@ def upload_video_with_metadata(
     Returns:
         Dictionary with upload results or None if upload fails
     """
-    # Authenticate
-    youtube = authenticate_youtube()
+    # Authenticate (cached across uploads in the same process)
+    youtube = get_youtube_service()
     if not youtube:
         print("⚠️  YouTube authentication failed - skipping upload")
         return None
@@ -436,30 +724,66 @@ def upload_video_with_metadata(
     description = metadata.get('youtube_description', metadata.get('description', ''))
     tags = metadata.get('tags', [])
 
-    # Upload video
+    # Upload video (thumbnail/playlist/comments follow together below)
     result = upload_video(
         youtube=youtube,
         video_path=video_path,
         title=title,
         description=description,
         tags=tags,
-        privacy_status=privacy_status,
-        thumbnail_path=thumbnail_path,
-        playlist_id=playlist_id
+        privacy_status=privacy_status
     )
 
     if not result:
         return None
 
-    video_id = result['video_id']
-
-    # Post comments if provided
-    if comments:
-        post_comments(youtube, video_id, comments)
+    # Thumbnail, playlist and comments are independent: overlap them
+    _run_post_upload_tasks(
+        youtube,
+        result['video_id'],
+        thumbnail_path=thumbnail_path,
+        playlist_id=playlist_id,
+        comments=comments
+    )
 
     return result
 
 
+def upload_videos_batch(
+    jobs: List[Dict],
+    workers: int = 2
+) -> List[Optional[Dict]]:
+    """
+    Upload several videos with one shared authentication.
+
+    Each job is a dict of upload_video_with_metadata keyword arguments
+    (video_path, metadata, and optionally thumbnail_path, comments,
+    privacy_status, playlist_id). Uploads are network-bound, so they run on
+    threads, each with its own HTTP transport.
+
+    Returns:
+        Upload results per job in input order (None where an upload failed)
+    """
+    if not jobs:
+        return []
+
+    # Authenticate once up front rather than racing in every worker
+    if not get_youtube_service():
+        print("⚠️  YouTube authentication failed - skipping batch upload")
+        return [None] * len(jobs)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+        futures = [executor.submit(upload_video_with_metadata, **job) for job in jobs]
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"❌ Upload error for {job.get('video_path')}: {e}")
+                results.append(None)
+    return results
+
+
 # Test function
 if __name__ == "__main__":
     import sys